@@ -0,0 +1,200 @@
+"""
+Judgement breakdowns of detailed plays, computed with NumPy over the whole play history at once.
+
+Usage: python -m scraper.analytics.judgements DATABASE [--by chart|day|month|year] [--top 20]
+"""
+import argparse
+import logging
+import os
+from dataclasses import dataclass
+from typing import Iterator
+
+import numpy as np
+
+from scraper.constants import Logging
+from scraper.exception.scraper_exception import ScraperError
+from scraper.metadata.metadata_manager import MetadataManager
+from scraper.resources.database import Database
+from scraper.resources.database_schema import PLAY_RECORD_VIEW
+from scraper.utils import scraping_utils as su
+
+logger = logging.getLogger(__name__.split(".")[-1])
+
+# Relative value of one note of each type, and the share of it each judgement earns (break bonus not included)
+NOTE_WEIGHTS = np.array([1, 2, 3, 1, 5], dtype=np.float64)  # In su.NOTE_TYPES order
+JUDGEMENT_WEIGHTS = np.array([1.0, 1.0, 0.8, 0.5, 0.0], dtype=np.float64)  # In su.JUDGEMENTS order
+
+JUDGEMENT_COLUMNS = [f"{note_type}_{judgement}" for note_type in su.NOTE_TYPES for judgement in su.JUDGEMENTS]
+NUMERIC_COLUMNS = ["fast", "late", *JUDGEMENT_COLUMNS, "combo", "max_combo", "sync", "max_sync"]
+KEY_COLUMNS = ["title", "difficulty", "music_type", "played_at"]
+
+# Length of the played_at prefix ("YYYY/MM/DD HH:MM") identifying each period
+PERIOD_PREFIX = {
+    "day": 10,
+    "month": 7,
+    "year": 4,
+}
+
+
+@dataclass
+class JudgementSummary:
+    """Aggregates of one group of plays per row, rows sorted by key"""
+    keys: list[tuple]
+    plays: np.ndarray  # (groups,)
+    miss_rate: np.ndarray  # (groups, note types) misses / notes, NaN where the group has no note of that type
+    fast_late_skew: np.ndarray  # (groups,) (fast - late) / (fast + late), -1 all late ... 1 all fast
+    accuracy: np.ndarray  # (groups,) judgement-weighted accuracy in %
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def rows(self) -> Iterator[dict]:
+        for group, key in enumerate(self.keys):
+            yield {
+                "key": key,
+                "plays": int(self.plays[group]),
+                **{f"{note_type}_miss_rate": float(self.miss_rate[group, i])
+                   for i, note_type in enumerate(su.NOTE_TYPES)},
+                "fast_late_skew": float(self.fast_late_skew[group]),
+                "accuracy": float(self.accuracy[group]),
+            }
+
+
+class JudgementAnalytics:
+    """
+    Judgement counters of every detailed play, held as NumPy arrays so aggregates are computed without a Python
+    loop over the plays.
+
+    Build one with load(). Counters the page did not provide are NaN and ignored by the aggregates.
+    """
+
+    def __init__(self, keys: np.ndarray, numeric: np.ndarray) -> None:
+        """
+        Args:
+            keys (np.ndarray): (plays, KEY_COLUMNS) strings.
+            numeric (np.ndarray): (plays, NUMERIC_COLUMNS) floats, NaN where NULL.
+        """
+        self.titles, self.difficulties, self.music_types, self.played_at = keys.T
+        self.fast = numeric[:, 0]
+        self.late = numeric[:, 1]
+        judgement_end = 2 + len(JUDGEMENT_COLUMNS)
+        # (plays, note types, judgements)
+        self.judgements = numeric[:, 2:judgement_end].reshape(-1, len(su.NOTE_TYPES), len(su.JUDGEMENTS))
+        self.combo, self.max_combo, self.sync, self.max_sync = numeric[:, judgement_end:].T
+
+    def __len__(self) -> int:
+        return len(self.fast)
+
+    @classmethod
+    def load(cls, database: Database, chunk_size: int = 10000) -> "JudgementAnalytics":
+        """
+        Read the analysed columns of every detailed play in one query, chunk by chunk, on a read-only connection.
+        Plays without a chart have no title, difficulty or music_type to be grouped by and are left out.
+        """
+        # Counters stored as page text by older versions (e.g. a blank cell) read as NULL
+        numeric = [f"CASE WHEN typeof({col}) IN ('integer', 'real') THEN {col} END" for col in NUMERIC_COLUMNS]
+        sql = (f"SELECT {', '.join(KEY_COLUMNS + numeric)} FROM {PLAY_RECORD_VIEW.name} "
+               f"WHERE detailed = 1 AND chart_id IS NOT NULL")
+        key_chunks, numeric_chunks = [], []
+        with database.reader() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            cursor.execute(sql)
+            while rows := cursor.fetchmany(chunk_size):
+                chunk = np.array(rows, dtype=object)
+                key_chunks.append(chunk[:, :len(KEY_COLUMNS)].astype(str))
+                # None -> NaN
+                numeric_chunks.append(chunk[:, len(KEY_COLUMNS):].astype(np.float64))
+
+        if not key_chunks:
+            return cls(np.empty((0, len(KEY_COLUMNS)), dtype=str), np.empty((0, len(NUMERIC_COLUMNS))))
+        analytics = cls(np.concatenate(key_chunks), np.concatenate(numeric_chunks))
+        logger.info(f"Loaded judgements of {len(analytics)} detailed play(s)")
+        return analytics
+
+    def by_chart(self) -> JudgementSummary:
+        """Aggregates per (title, difficulty, music_type)"""
+        charts = np.stack([self.titles, self.difficulties, self.music_types], axis=1)
+        keys, codes = np.unique(charts, axis=0, return_inverse=True)
+        return self._summarize([tuple(map(str, key)) for key in keys], codes.reshape(-1))
+
+    def by_period(self, period: str = "month") -> JudgementSummary:
+        """Aggregates per day, month or year of play"""
+        if period not in PERIOD_PREFIX:
+            raise ValueError(f"Unknown period '{period}', must be one of {list(PERIOD_PREFIX)}")
+        periods = self.played_at.astype(f"U{PERIOD_PREFIX[period]}")
+        keys, codes = np.unique(periods, return_inverse=True)
+        return self._summarize([(str(key),) for key in keys], codes.reshape(-1))
+
+    def overall(self) -> JudgementSummary:
+        return self._summarize([("all",)] if len(self) else [], np.zeros(len(self), dtype=np.intp))
+
+    def accuracy(self) -> np.ndarray:
+        """(plays,) judgement-weighted accuracy of each play in %"""
+        return self._accuracy(np.nan_to_num(self.judgements))
+
+    def _summarize(self, keys: list[tuple], codes: np.ndarray) -> JudgementSummary:
+        groups = len(keys)
+        judgements = np.nan_to_num(self.judgements).reshape(len(self), len(JUDGEMENT_COLUMNS))
+        # Per-group sums of every counter, one bincount per column
+        sums = np.stack([np.bincount(codes, weights=column, minlength=groups) for column in judgements.T], axis=1)
+        sums = sums.reshape(groups, len(su.NOTE_TYPES), len(su.JUDGEMENTS))
+        fast = np.bincount(codes, weights=np.nan_to_num(self.fast), minlength=groups)
+        late = np.bincount(codes, weights=np.nan_to_num(self.late), minlength=groups)
+
+        notes = sums.sum(axis=2)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            miss_rate = sums[:, :, su.JUDGEMENTS.index("miss")] / notes
+            fast_late_skew = (fast - late) / (fast + late)
+        return JudgementSummary(
+            keys=keys,
+            plays=np.bincount(codes, minlength=groups),
+            miss_rate=miss_rate,
+            fast_late_skew=fast_late_skew,
+            accuracy=self._accuracy(sums),
+        )
+
+    @staticmethod
+    def _accuracy(counts: np.ndarray) -> np.ndarray:
+        """(..., note types, judgements) counts -> (...) weighted accuracy in %"""
+        weighted_notes = counts * NOTE_WEIGHTS[:, None]
+        earned = (weighted_notes * JUDGEMENT_WEIGHTS).sum(axis=(-2, -1))
+        total = weighted_notes.sum(axis=(-2, -1))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return 100 * earned / total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("database", help="Path to the scraper's SQLite database file")
+    parser.add_argument("--by", choices=["chart", *PERIOD_PREFIX], default="month")
+    parser.add_argument("--top", type=int, default=20, help="Number of groups shown, most played first")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format=Logging.LOG_FORMAT)
+    if not os.path.isfile(args.database):
+        parser.error(f"Database file not found: {args.database}")
+
+    database = Database(os.path.abspath(args.database))
+    try:
+        # Brings a database the scraper has not opened since an update to the current version, as the scraper would
+        MetadataManager(database)
+        analytics = JudgementAnalytics.load(database)
+    except ScraperError as e:
+        logger.error(e)
+        raise SystemExit(1)
+    finally:
+        database.close_connection()
+
+    summary = analytics.by_chart() if args.by == "chart" else analytics.by_period(args.by)
+    order = np.argsort(-summary.plays, kind="stable")[:args.top]
+    miss_headers = "".join(f"{note_type + ' miss':>12}" for note_type in su.NOTE_TYPES)
+    print(f"{'group':<50}{'plays':>7}{miss_headers}{'fast/late':>11}{'accuracy':>10}")
+    for group in order:
+        misses = "".join(f"{rate:>12.2%}" for rate in summary.miss_rate[group])
+        print(f"{' / '.join(summary.keys[group]):<50.50}{summary.plays[group]:>7}{misses}"
+              f"{summary.fast_late_skew[group]:>+11.2f}{summary.accuracy[group]:>9.3f}%")
+
+
+if __name__ == "__main__":
+    main()
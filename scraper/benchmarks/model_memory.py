@@ -0,0 +1,57 @@
+"""
+Memory held by play_data rows loaded through Database.select into the slotted PlayData, against the same
+dataclass without slots (one __dict__ per instance).
+
+Usage: python -m scraper.benchmarks.model_memory [--rows 1000000]
+"""
+import argparse
+import gc
+import logging
+import tracemalloc
+from dataclasses import fields, make_dataclass
+
+from scraper.benchmarks.synthetic import temporary_database
+from scraper.resources.database import Database
+from scraper.resources.database_schema import PLAY_DATA_TABLE
+from scraper.resources.models import PlayData
+
+# What generate_models emitted before slots were enabled
+DictPlayData = make_dataclass("DictPlayData", [(field.name, field.type, field.default) for field in fields(PlayData)])
+
+
+def measure(database: Database, entity_class: type) -> int:
+    """
+    Returns:
+        int: Bytes still allocated while the loaded rows are alive
+    """
+    gc.collect()
+    tracemalloc.start()
+    rows = database.select(PLAY_DATA_TABLE, None, entity_class, None)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del rows
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    with temporary_database(args.rows) as database:
+        # Warm up the statement and row mapper caches so they are not counted
+        database.select(PLAY_DATA_TABLE, None, PlayData, 1)
+        database.select(PLAY_DATA_TABLE, None, DictPlayData, 1)
+
+        dict_size = measure(database, DictPlayData)
+        slots_size = measure(database, PlayData)
+
+    print(f"{args.rows} rows, {len(fields(PlayData))} fields per row")
+    print(f"  __dict__ dataclass : {dict_size / 2 ** 20:>10,.1f} MiB ({dict_size / args.rows:,.0f} B/row)")
+    print(f"  slotted dataclass  : {slots_size / 2 ** 20:>10,.1f} MiB ({slots_size / args.rows:,.0f} B/row, "
+          f"{1 - slots_size / dict_size:.0%} less)")
+
+
+if __name__ == "__main__":
+    main()
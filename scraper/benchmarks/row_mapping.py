@@ -0,0 +1,77 @@
+"""
+Rows/sec of Database.select mapping play_data rows into PlayData, against the previous per-row reflection mapping.
+
+Usage: python -m scraper.benchmarks.row_mapping [--rows 100000] [--repeat 3]
+"""
+import argparse
+import logging
+import sqlite3
+import time
+from dataclasses import fields, is_dataclass
+from typing import Union
+
+from scraper.benchmarks.synthetic import temporary_database
+from scraper.resources.database_schema import PLAY_DATA_TABLE
+from scraper.resources.models import PlayData
+
+
+def reflection_map_row(row: sqlite3.Row, data_class):
+    """The mapping Database.select used to run for every row"""
+    row_dict = dict(row)
+    if data_class is not None and is_dataclass(data_class):
+        for field in fields(data_class):
+            field_type = field.type
+            is_bool_field = False
+            origin = getattr(field_type, "__origin__", None)
+            args = getattr(field_type, "__args__", ())
+
+            if field_type is bool:
+                is_bool_field = True
+            elif origin is Union and bool in args and type(None) in args:
+                is_bool_field = True
+
+            if is_bool_field and field.name in row_dict and row_dict[field.name] is not None:
+                row_dict[field.name] = bool(row_dict[field.name])
+        return data_class(**row_dict)
+    return row_dict
+
+
+def best_of(repeat: int, function) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    with temporary_database(args.rows) as database:
+        conn = database._get_active_connection()
+
+        def reflection():
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
+            cursor.execute(f"SELECT * FROM {PLAY_DATA_TABLE.name}")
+            return [reflection_map_row(row, PlayData) for row in cursor.fetchall()]
+
+        def compiled():
+            return database.select(PLAY_DATA_TABLE, None, PlayData, None)
+
+        assert reflection() == compiled()
+        before = best_of(args.repeat, reflection)
+        after = best_of(args.repeat, compiled)
+
+    print(f"{args.rows} rows, best of {args.repeat}")
+    print(f"  reflection mapping : {args.rows / before:>12,.0f} rows/sec")
+    print(f"  compiled mapper    : {args.rows / after:>12,.0f} rows/sec ({before / after:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Iterator
+
+from scraper.resources.chart_registry import ChartRegistry
+from scraper.resources.database import Database
+from scraper.resources.database_schema import PLAY_DATA_TABLE
+from scraper.resources.models import PlayData, PlayRecord
+from scraper.utils import scraping_utils as su
+
+
+def make_play_record(number: int) -> PlayRecord:
+    """
+    Build a deterministic play, with its song and chart, for benchmarking. One play in 50 is left undetailed, like
+    the few orphans of a real history
+    """
+    judgements = {
+        f"{note_type}_{judgement}": (number * (row + 1) + column) % 500
+        for row, note_type in enumerate(su.NOTE_TYPES)
+        for column, judgement in enumerate(su.JUDGEMENTS)
+    }
+    achievement = f"{90 + number % 1050 / 100:.4f}%"
+    dx_score = f"{number % 2500} / 2500"
+    return PlayRecord(
+        idx=f"{number % 10},{1700000000 + number}",
+        title=f"Song {number % 1000}",
+        difficulty=["BASIC", "ADVANCED", "EXPERT", "MASTER", "Re:MASTER"][number % 5],
+        track=f"TRACK {number % 4 + 1}",
+        music_type=["dx", "standard"][number % 2],
+        new_achievement=number % 7 == 0,
+        achievement=achievement,
+        rank="SSS",
+        new_dx_score=number % 11 == 0,
+        dx_score=dx_score,
+        dx_stars=number % 6,
+        combo_status="FC",
+        sync_status="FS",
+        place=None,
+        played_at="2024/05/01 21:30",
+        fast=number % 50,
+        late=number % 30,
+        **judgements,
+        combo=number % 800,
+        max_combo=800,
+        sync=None,
+        max_sync=None,
+        detailed=number % 50 != 0,
+        play_data_version=1,
+        achievement_value=su.parse_achievement_value(achievement),
+        dx_score_value=number % 2500,
+        dx_score_max=2500,
+        played_at_epoch=1714566600,
+    )
+
+
+def make_play_data(number: int) -> PlayData:
+    """The play_data row of make_play_record, without a chart"""
+    record = make_play_record(number)
+    return PlayData(**{name: getattr(record, name) for name in PlayData.COLUMNS})
+
+
+@contextmanager
+def temporary_database(rows: int = 0) -> Iterator[Database]:
+    """Database in a temporary file, pre-filled with the given number of synthetic plays"""
+    with tempfile.TemporaryDirectory() as folder:
+        database = Database(os.path.join(folder, "benchmark.db"))
+        try:
+            plays = [make_play_record(number) for number in range(rows)]
+            with database.unit_of_work() as uow:
+                ChartRegistry(database).assign_charts(uow, plays)
+                for play in plays:
+                    uow.insert(PLAY_DATA_TABLE, play)
+            yield database
+        finally:
+            database.close_connection()
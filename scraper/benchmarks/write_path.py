@@ -0,0 +1,58 @@
+"""
+Rows/sec of PlayData inserts when the parameters are bound with dataclasses.asdict, by reading every attribute, or
+with the generated to_row() codec (what Database uses).
+
+Each run encodes the entities and writes them with executemany in one transaction, like UnitOfWork.commit.
+
+Usage: python -m scraper.benchmarks.write_path [--rows 100000] [--repeat 3]
+"""
+import argparse
+import logging
+from dataclasses import asdict
+
+from scraper.benchmarks.row_mapping import best_of
+from scraper.benchmarks.synthetic import make_play_data, temporary_database
+from scraper.resources.database_schema import PLAY_DATA_TABLE
+from scraper.resources.models import PlayData
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    entities = [make_play_data(number) for number in range(args.rows)]
+
+    with temporary_database() as database:
+        conn = database._get_active_connection()
+        columns = database.statements.insert_columns(PLAY_DATA_TABLE, PlayData)
+        sql = database.statements.insert_sql(PLAY_DATA_TABLE, columns)
+        binder = database.statements.binder(PlayData, columns)
+
+        encoders = {
+            "dataclasses.asdict": lambda entity: tuple(v for k, v in asdict(entity).items() if k in columns),
+            "getattr per column": lambda entity: tuple(getattr(entity, col) for col in columns),
+            "generated to_row  ": binder,
+        }
+
+        def write(encode):
+            def run():
+                with conn:
+                    conn.executemany(sql, map(encode, entities))
+                conn.execute(f"DELETE FROM {PLAY_DATA_TABLE.name}")
+                conn.commit()
+            return run
+
+        assert len({tuple(map(encode, entities[:100])) for encode in encoders.values()}) == 1
+        timings = {name: best_of(args.repeat, write(encode)) for name, encode in encoders.items()}
+
+    baseline = timings["dataclasses.asdict"]
+    print(f"{args.rows} rows, best of {args.repeat}")
+    for name, timing in timings.items():
+        print(f"  {name} : {args.rows / timing:>12,.0f} rows/sec ({baseline / timing:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Checks that every query Database issues on its access paths is served by an index.
+
+Runs each access path against a synthetic database, records the SQL actually executed on the writer and read
+connections, and runs EXPLAIN QUERY PLAN on every filtered statement. Exits with status 1 if any of them scans a
+whole table. Statements without a WHERE clause read every row by design and are not checked.
+
+Add new Database queries to ACCESS_PATHS so they stay covered. tests/test_query_plans.py asserts every one of them
+under pytest.
+
+Usage: python -m scraper.checks.query_plans [--rows 2000] [--verbose]
+"""
+import argparse
+import logging
+import re
+import sqlite3
+import sys
+from dataclasses import replace
+from itertools import count
+from typing import Callable
+
+from scraper.benchmarks.synthetic import temporary_database, make_play_record
+from scraper.resources.chart_registry import ChartRegistry
+from scraper.resources.database import Database
+from scraper.resources.database_schema import PLAY_DATA_TABLE, METADATA_TABLE, PLAY_RECORD_VIEW
+from scraper.resources.models import PlayData, Metadata, PlayRecord, SongData
+from scraper.utils import scraping_utils as su
+
+
+_unseen_songs = count()
+
+
+def _assign_new_chart(database: Database) -> None:
+    """Store a chart never seen before, as a records check does"""
+    record = replace(make_play_record(0), title=f"Unseen song {next(_unseen_songs)}")
+    with database.unit_of_work() as uow:
+        ChartRegistry(database).assign_charts(uow, [record])
+
+
+def _assign_new_song(database: Database) -> None:
+    """Store a song never seen before, as a song scores refresh does"""
+    with database.unit_of_work() as uow:
+        ChartRegistry(database).assign_songs(uow, [SongData(song_title=f"Unseen song {next(_unseen_songs)}",
+                                                            song_type="dx")])
+
+
+# One call per filtered query shape Database issues outside of schema initialization. Upserts are not listed, their
+# conflict target is always a primary key or unique index
+ACCESS_PATHS: dict[str, Callable[[Database], object]] = {
+    "select play by idx": lambda db: db.select(PLAY_DATA_TABLE, {"idx": "1,1700000001"}, PlayData),
+    "select plays of a chart": lambda db: db.select(PLAY_DATA_TABLE, PlayData(chart_id=1), PlayData, None),
+    "select play record by idx": lambda db: db.select(PLAY_RECORD_VIEW, {"idx": "1,1700000001"}, PlayRecord),
+    "assign a new chart": _assign_new_chart,
+    "assign a new song": _assign_new_song,
+    "SSS+ plays": lambda db: db.get_play_data_by_achievement(su.parse_achievement_value("100.5000%")),
+    "check play exists": lambda db: db.check_if_play_data_exists("1,1700000001"),
+    "find undetailed plays": lambda db: db.find_undetailed_plays([f"{n % 10},{1700000000 + n}" for n in range(50)]),
+    "plays in a time window": lambda db: db.get_play_data_between(1714566600, 1714566600 + 7 * 24 * 3600),
+    "stream after id": lambda db: list(db.iter_select(PLAY_DATA_TABLE, None, PlayData, after_id=10)),
+    "stream play records after id": lambda db: list(db.iter_select(PLAY_RECORD_VIEW, None, PlayRecord, after_id=10)),
+    "select song data": lambda db: db.get_song_data("Song 1", "dx"),
+    "select metadata by id": lambda db: db.select(METADATA_TABLE, {"id": 1}, Metadata),
+    "backfill": lambda db: db.backfill(PLAY_DATA_TABLE, ["achievement"], ["achievement_value"],
+                                       lambda achievement: (su.parse_achievement_value(achievement),)),
+}
+
+# Statements about the schema itself, not table data
+IGNORED = re.compile(r"^\s*(PRAGMA|BEGIN|COMMIT|ROLLBACK|CREATE|ALTER)\b|sqlite_master", re.IGNORECASE)
+FILTERED = re.compile(r"\bWHERE\b", re.IGNORECASE)
+# Scans of a VALUES list read the query's own parameters, not a table
+FULL_SCAN = re.compile(r"^SCAN (?!CONSTANT ROW|\d+ CONSTANT ROWS)(\w+)(?! USING)")
+
+
+def full_scans(conn: sqlite3.Connection, sql: str) -> list[str]:
+    """Plan steps of the statement that scan a whole table without an index"""
+    plan = conn.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+    return [step[3] for step in plan if FULL_SCAN.match(step[3])]
+
+
+def prepare(database: Database) -> None:
+    """Metadata row and planner statistics, so plans match those of a real database"""
+    database.insert(METADATA_TABLE, Metadata(id=1, scraper_version="check", database_version=0, play_data_version=0))
+    writer = database._get_active_connection()
+    writer.execute("ANALYZE")
+    writer.commit()
+
+
+def statement_plans(database: Database, access_path: Callable[[Database], object]) -> list[tuple[str, list[str]]]:
+    """
+    Run the access path and plan every filtered statement it issued.
+
+    Returns:
+        list[tuple[str, list[str]]]: (SQL, plan steps scanning a whole table) per statement, in execution order
+    """
+    statements: list[str] = []
+    writer = database._get_active_connection()
+    # The pool only ever opens this one reader, since connections are borrowed one at a time
+    with database.reader() as reader:
+        reader.set_trace_callback(statements.append)
+    writer.set_trace_callback(statements.append)
+    try:
+        access_path(database)
+    finally:
+        writer.set_trace_callback(None)
+        reader.set_trace_callback(None)
+
+    checked = [sql for sql in dict.fromkeys(statements) if FILTERED.search(sql) and not IGNORED.search(sql)]
+    return [(sql, full_scans(writer, sql)) for sql in checked]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--verbose", action="store_true", help="Print the plan of every checked statement")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    failures = 0
+    with temporary_database(args.rows) as database:
+        prepare(database)
+        writer = database._get_active_connection()
+
+        for name, access_path in ACCESS_PATHS.items():
+            plans = statement_plans(database, access_path)
+            if not plans:
+                print(f"[ ?? ] {name}: no filtered statement recorded")
+                failures += 1
+            for sql, scans in plans:
+                failures += bool(scans)
+                print(f"[{'FAIL' if scans else ' ok '}] {name}: {' | '.join(scans) if scans else ''}".rstrip(": "))
+                if scans or args.verbose:
+                    print(f"         {sql[:200]}")
+                    if args.verbose:
+                        for step in writer.execute(f"EXPLAIN QUERY PLAN {sql}"):
+                            print(f"           {step[3]}")
+
+    print(f"{failures} access path(s) not covered by an index" if failures else "Every access path uses an index")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
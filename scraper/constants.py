@@ -67,6 +67,15 @@ class Endpoints:
     }
 
 
+class PlayedAt:
+    """
+    How the records page displays play times. The same for every region: the international site also shows Japan
+    Standard Time, which has no daylight saving time
+    """
+    FORMAT: str = "%Y/%m/%d %H:%M"
+    UTC_OFFSET_HOURS: int = 9
+
+
 def load_endpoints(region: str):
     """
     Dynamically attach endpoints for the selected region to the Endpoints class.
@@ -2,6 +2,7 @@ import io
 import logging
 import os
 import zipfile
+from typing import Optional
 
 import chromedriver_autoinstaller
 import requests
@@ -85,15 +86,26 @@ def ensure_chromedriver(version: str) -> str:
     return driver_path
 
 
-def get_chrome_driver() -> WebDriver:
+def resolve_chromedriver_path() -> str:
+    """
+    Detect the installed Chrome version and ensure a matching ChromeDriver, downloading it if needed.
+
+    :return: Path to the ChromeDriver executable
+    """
+    return ensure_chromedriver(get_installed_chrome_version())
+
+
+def get_chrome_driver(driver_path: Optional[str] = None) -> WebDriver:
     """
     Create and return a Selenium Chrome WebDriver with anti-detection tweaks.
     Ensures a valid ChromeDriver is available.
 
+    :param driver_path: ChromeDriver from resolve_chromedriver_path(). Resolved now if None, pass it when starting
+        several drivers (e.g. a DriverPool factory) so the version check and download run once
     :return: selenium.webdriver.remote.webdriver.WebDriver
     """
-    chrome_version = get_installed_chrome_version()
-    driver_path = ensure_chromedriver(chrome_version)
+    if driver_path is None:
+        driver_path = resolve_chromedriver_path()
 
     options = webdriver.ChromeOptions()
     options.add_argument("--disable-blink-features=AutomationControlled")
@@ -0,0 +1,191 @@
+import logging
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from scraper.exception.scraper_exception import ScraperError
+from scraper.login_session import SESSION_EXPIRED_PATHS
+from scraper.utils.request_scheduler import RequestScheduler
+
+logger = logging.getLogger(__name__.split(".")[-1])
+
+T = TypeVar("T")
+
+
+class SessionExpiredError(ScraperError):
+    """A pooled driver was sent back to the login or error page, the shared login has to be renewed"""
+
+
+class _Slot:
+    """One pooled WebDriver and the bookkeeping needed to decide when to replace it"""
+
+    def __init__(self, number: int) -> None:
+        self.number = number
+        self.driver: Optional[WebDriver] = None
+        self.jobs = 0  # Jobs run since the driver was started
+        self.session_version = -1  # Version of the shared cookies loaded into the driver
+
+
+class DriverPool:
+    """
+    Extra WebDriver instances that share the login of the main driver, so page loads can run in parallel.
+
+    Jobs are callables taking a WebDriver. submit() runs them on the first free slot and returns a Future. Before
+    each job the slot's driver is health checked and replaced if it stopped responding, has run
+    `recycle_after` jobs or failed its previous job. Drivers are started lazily, on the first job of their slot.
+
+    The login itself is never done by the pool: share_session() copies the cookies of a logged in driver, and every
+    slot loads them before its next job.
+    """
+
+    def __init__(self, driver_factory: Callable[[], WebDriver], size: int, scheduler: RequestScheduler,
+                 site_url: str, recycle_after: int = 200) -> None:
+        """
+        Args:
+            driver_factory (Callable): Creates a new WebDriver, e.g. get_chrome_driver bound to a resolved driver path.
+            size (int): Number of drivers, and of jobs running at the same time.
+            scheduler (RequestScheduler): Rate limiter shared with every other page load.
+            site_url (str): Any page of the site the cookies belong to. Cookies can only be set on their own domain.
+            recycle_after (int): Jobs a driver runs before it is replaced, to keep browser memory in check.
+        """
+        if size < 1:
+            raise ValueError(f"Driver pool size must be at least 1, got {size}")
+        self.driver_factory = driver_factory
+        self.size = size
+        self.scheduler = scheduler
+        self.site_url = site_url
+        self.recycle_after = recycle_after
+        self._cookies: list[dict] = []
+        self._session_version = 0
+        self._session_lock = threading.Lock()
+        self._slots: queue.Queue[_Slot] = queue.Queue()
+        for number in range(size):
+            self._slots.put(_Slot(number))
+        self._executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="driver-pool")
+        self._closed = False
+
+    @classmethod
+    def from_config(cls, config, driver_factory: Callable[[], WebDriver], scheduler: RequestScheduler,
+                    site_url: str) -> Optional["DriverPool"]:
+        """Pool sized by DRIVER_POOL_SIZE, or None if the pool is disabled (size 0)"""
+        size = config.get_int("DRIVER_POOL_SIZE", 0)
+        if size <= 0:
+            return None
+        return cls(driver_factory, size, scheduler, site_url, config.get_int("DRIVER_POOL_RECYCLE_AFTER", 200))
+
+    def share_session(self, driver: WebDriver) -> None:
+        """Copy the cookies of a logged in driver. Slots pick them up before their next job"""
+        host = urlsplit(self.site_url).hostname or ""
+        cookies = [cookie for cookie in driver.get_cookies() if self._matches_host(host, cookie.get("domain"))]
+        with self._session_lock:
+            self._cookies = cookies
+            self._session_version += 1
+        logger.info(f"Sharing {len(cookies)} cookie(s) with {self.size} pooled driver(s)")
+
+    @staticmethod
+    def _matches_host(host: str, cookie_domain: Optional[str]) -> bool:
+        """Whether a cookie of that domain is sent to the host. Cookies without a domain are never shared"""
+        domain = (cookie_domain or "").lstrip(".")
+        return bool(domain) and (host == domain or host.endswith("." + domain))
+
+    def submit(self, job: Callable[[WebDriver], T]) -> Future:
+        """
+        Args:
+            job (Callable[[WebDriver], T]): Runs on a pooled driver, which it must leave on a single window.
+
+        Returns:
+            Future[T]: Result of the job, or the exception it raised
+        """
+        if self._closed:
+            raise ScraperError("Driver pool is closed")
+        return self._executor.submit(self._run, job)
+
+    def fetch(self, url: str) -> Future:
+        """Load a page on a pooled driver. Future of its HTML, failing with SessionExpiredError when logged out"""
+        return self.submit(lambda driver: self._load(driver, url))
+
+    def _load(self, driver: WebDriver, url: str) -> str:
+        self.scheduler.acquire()
+        driver.get(url)
+        if any(path in driver.current_url for path in SESSION_EXPIRED_PATHS):
+            raise SessionExpiredError(f"Session expired loading {url}")
+        return driver.page_source
+
+    def _run(self, job: Callable[[WebDriver], T]) -> T:
+        # Never waits, the executor runs at most `size` jobs at a time
+        slot = self._slots.get()
+        try:
+            try:
+                # Also covers a driver that failed to start or load the cookies, it is never reused half prepared
+                driver = self._prepare(slot)
+                slot.jobs += 1
+                return job(driver)
+            except WebDriverException:
+                # State of the browser unknown after a failed command, start over on the next job
+                self._stop(slot)
+                raise
+        finally:
+            self._slots.put(slot)
+
+    def _prepare(self, slot: _Slot) -> WebDriver:
+        """Driver of the slot, (re)started if needed and holding the current shared cookies"""
+        if slot.driver is not None and slot.jobs >= self.recycle_after:
+            logger.debug(f"Recycling pooled driver {slot.number} after {slot.jobs} jobs")
+            self._stop(slot)
+        if slot.driver is not None and not self._is_healthy(slot.driver):
+            logger.warning(f"Pooled driver {slot.number} is not responding, replacing it")
+            self._stop(slot)
+        if slot.driver is None:
+            slot.driver = self.driver_factory()
+            slot.jobs = 0
+            slot.session_version = -1
+            logger.debug(f"Started pooled driver {slot.number}")
+
+        with self._session_lock:
+            cookies, version = self._cookies, self._session_version
+        if slot.session_version != version:
+            self._load_cookies(slot.driver, cookies)
+            slot.session_version = version
+        return slot.driver
+
+    def _load_cookies(self, driver: WebDriver, cookies: list[dict]) -> None:
+        self.scheduler.acquire()
+        driver.get(self.site_url)
+        driver.delete_all_cookies()
+        for cookie in cookies:
+            # Selenium rejects the expiry of some drivers' own cookie format, the browser session is enough
+            driver.add_cookie({key: value for key, value in cookie.items() if key != "expiry"})
+
+    @staticmethod
+    def _is_healthy(driver: WebDriver) -> bool:
+        try:
+            driver.execute_script("return document.readyState;")
+            return len(driver.window_handles) > 0
+        except WebDriverException:
+            return False
+
+    @staticmethod
+    def _stop(slot: _Slot) -> None:
+        if slot.driver is None:
+            return
+        try:
+            slot.driver.quit()
+        except WebDriverException as e:
+            logger.debug(f"Error quitting pooled driver {slot.number} : {e}")
+        slot.driver = None
+
+    def close(self) -> None:
+        """Wait for the running jobs, cancel the queued ones and quit every driver"""
+        self._closed = True
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        while not self._slots.empty():
+            self._stop(self._slots.get_nowait())
+        logger.info("Driver pool closed")
+
+    def __repr__(self):
+        return f"DriverPool(size={self.size}, recycle_after={self.recycle_after})"
@@ -0,0 +1,224 @@
+"""
+Export a table or view (play_record, every play with its song and chart, by default) to CSV, JSON Lines or Parquet.
+
+Rows are streamed from the database and written chunk by chunk, so memory stays bounded whatever the history size.
+With --incremental NAME, only rows added since the previous export of that name are written: the highest exported
+id is stored in the export_state table once the output file is complete.
+
+Usage: python -m scraper.export.exporter DATABASE OUTPUT [--format csv|jsonl|parquet] [--incremental NAME]
+                                         [--chunk-size 5000]
+"""
+import argparse
+import csv
+import json
+import logging
+import os
+from abc import ABC, abstractmethod
+from datetime import datetime
+from itertools import islice
+from typing import Any, Iterator, Optional, TextIO
+
+from scraper.constants import Logging
+from scraper.exception.scraper_exception import ScraperError
+from scraper.metadata.metadata_manager import MetadataManager
+from scraper.resources.database import Database
+from scraper.resources.database_schema import Table, PLAY_RECORD_VIEW, EXPORT_STATE_TABLE
+from scraper.resources.models import PlayRecord, ExportState
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # Optional, only needed for Parquet exports
+    pyarrow = None
+
+logger = logging.getLogger(__name__.split(".")[-1])
+
+
+class RowWriter(ABC):
+    """Writes chunks of row tuples, in table column order, to one output file"""
+
+    def __init__(self, path: str, table: Table) -> None:
+        self.path = path
+        self.table = table
+        self.columns = [col.name for col in table.columns]
+
+    @abstractmethod
+    def write(self, rows: list[tuple]) -> None:
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        pass
+
+
+class CsvRowWriter(RowWriter):
+    def __init__(self, path: str, table: Table) -> None:
+        super().__init__(path, table)
+        self._file: TextIO = open(path, "w", encoding="utf-8", newline="")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self.columns)
+
+    def write(self, rows: list[tuple]) -> None:
+        self._writer.writerows(rows)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class JsonLinesRowWriter(RowWriter):
+    def __init__(self, path: str, table: Table) -> None:
+        super().__init__(path, table)
+        self._file: TextIO = open(path, "w", encoding="utf-8")
+
+    def write(self, rows: list[tuple]) -> None:
+        self._file.writelines(json.dumps(dict(zip(self.columns, row)), ensure_ascii=False) + "\n" for row in rows)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ParquetRowWriter(RowWriter):
+    """Every chunk becomes one row group"""
+
+    ARROW_TYPES = {
+        "INTEGER": "int64",
+        "TEXT": "string",
+        "BOOLEAN": "bool_",
+    }
+
+    def __init__(self, path: str, table: Table) -> None:
+        if pyarrow is None:
+            raise ScraperError("Parquet export requires pyarrow, install it with 'pip install pyarrow'")
+        super().__init__(path, table)
+        self._schema = pyarrow.schema([
+            (col.name, getattr(pyarrow, self.ARROW_TYPES.get(col.data_type.upper(), "string"))())
+            for col in table.columns
+        ])
+        self._writer = pyarrow.parquet.ParquetWriter(path, self._schema)
+
+    def write(self, rows: list[tuple]) -> None:
+        arrays = [pyarrow.array(values, type=field.type) for values, field in zip(zip(*rows), self._schema)]
+        self._writer.write_table(pyarrow.Table.from_arrays(arrays, schema=self._schema))
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+WRITERS: dict[str, type[RowWriter]] = {
+    "csv": CsvRowWriter,
+    "jsonl": JsonLinesRowWriter,
+    "parquet": ParquetRowWriter,
+}
+
+
+def _chunks(rows: Iterator[Any], chunk_size: int) -> Iterator[list]:
+    while chunk := list(islice(rows, chunk_size)):
+        yield chunk
+
+
+def export_table(
+        database: Database,
+        output_path: str,
+        export_format: str,
+        table: Table = PLAY_RECORD_VIEW,
+        entity_class: type = PlayRecord,
+        incremental_name: Optional[str] = None,
+        chunk_size: int = 5000,
+) -> int:
+    """
+    Stream the table's rows, in id order, into output_path.
+
+    The file is written under a temporary name and only renamed to output_path once complete. In incremental mode
+    the high-water id is stored after that, so a failed export is simply redone by the next run.
+
+    Args:
+        database (Database): Database to export from.
+        output_path (str): File to write, replaced if it exists.
+        export_format (str): One of WRITERS.
+        table (Table): Table or view to export.
+        entity_class (type): Generated model of the table, used to encode the rows.
+        incremental_name (str, optional): Name of the incremental export. Only rows newer than the previous
+            export with that name are written. If None, every row is written and no state is stored.
+        chunk_size (int): Rows read and written at a time.
+
+    Returns:
+        int: Number of rows written. No file is created when there is nothing to write.
+    """
+    writer_class = WRITERS.get(export_format)
+    if writer_class is None:
+        raise ScraperError(f"Unknown export format '{export_format}', must be one of {list(WRITERS)}")
+
+    state: Optional[ExportState] = None
+    if incremental_name is not None:
+        state = database.select(EXPORT_STATE_TABLE, {"export_name": incremental_name}, ExportState)
+        if state is not None and state.table_name != table.name:
+            raise ScraperError(f"Export '{incremental_name}' tracks [{state.table_name}], not [{table.name}]")
+    last_id = state.last_exported_id if state is not None else 0
+
+    entities = database.iter_select(table, None, entity_class, chunk_size, after_id=last_id)
+    temporary_path = f"{output_path}.part"
+    writer: Optional[RowWriter] = None
+    count = 0
+    try:
+        for chunk in _chunks(entities, chunk_size):
+            if writer is None:
+                writer = writer_class(temporary_path, table)
+            writer.write([entity.to_row() for entity in chunk])
+            count += len(chunk)
+            last_id = chunk[-1].id
+        if writer is not None:
+            writer.close()
+            writer = None
+            os.replace(temporary_path, output_path)
+    finally:
+        entities.close()  # Returns the read connection to the pool
+        if writer is not None:
+            writer.close()
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+
+    if count == 0:
+        logger.info(f"No new rows in [{table.name}] to export")
+        return count
+    logger.info(f"Exported {count} row(s) from [{table.name}] to {output_path}")
+
+    if incremental_name is not None:
+        database.upsert(EXPORT_STATE_TABLE, ExportState(
+            export_name=incremental_name,
+            table_name=table.name,
+            last_exported_id=last_id,
+            exported_at=datetime.now().isoformat(timespec="seconds"),
+        ))
+        logger.info(f"Export '{incremental_name}' high-water id is now {last_id}")
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("database", help="Path to the scraper's SQLite database file")
+    parser.add_argument("output", help="File to write")
+    parser.add_argument("--format", choices=list(WRITERS), help="Defaults to the output file extension")
+    parser.add_argument("--incremental", metavar="NAME", help="Only export rows added since the last run of NAME")
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format=Logging.LOG_FORMAT)
+    export_format = args.format or os.path.splitext(args.output)[1].lstrip(".").lower()
+    if not os.path.isfile(args.database):
+        parser.error(f"Database file not found: {args.database}")
+
+    database = Database(os.path.abspath(args.database))
+    try:
+        # Brings a database the scraper has not opened since an update to the current version, as the scraper would
+        MetadataManager(database)
+        export_table(database, args.output, export_format, incremental_name=args.incremental,
+                     chunk_size=args.chunk_size)
+    except ScraperError as e:
+        logger.error(e)
+        raise SystemExit(1)
+    finally:
+        database.close_connection()
+
+
+if __name__ == "__main__":
+    main()
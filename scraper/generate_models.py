@@ -1,6 +1,6 @@
 import os
 
-from scraper.resources.database_schema import TABLE_LIST, Table, Column
+from scraper.resources.database_schema import TABLE_LIST, VIEW_LIST, Table, Column
 
 SQL_TO_PY = {
     "INTEGER": "int",
@@ -21,6 +21,13 @@ def class_name_from_table(name: str) -> str:
     return "".join(part.capitalize() for part in name.split("_"))
 
 
+def row_value(col: Column, position: int) -> str:
+    # SQLite stores BOOLEAN as 0/1
+    if col.data_type.upper() == "BOOLEAN":
+        return f"None if row[{position}] is None else bool(row[{position}])"
+    return f"row[{position}]"
+
+
 def generate_dataclass_code(table: Table) -> str:
     class_name = class_name_from_table(table.name)
 
@@ -31,19 +38,38 @@ def generate_dataclass_code(table: Table) -> str:
     )
 
     lines = ["from dataclasses import dataclass"]
-    if requires_optional:
-        lines.append("from typing import Optional")
+    lines.append("from typing import ClassVar, Optional, Sequence" if requires_optional
+                 else "from typing import ClassVar, Sequence")
 
     lines.extend([
         "",
         "",
-        "@dataclass",
+        "@dataclass(slots=True)",
         f"class {class_name}:"
     ])
 
     for col in table.columns:
         lines.append(f"    {col.name}: {python_type(col)} = None")
 
+    # Row codecs, in table column order
+    lines.extend([
+        "",
+        "    COLUMNS: ClassVar[tuple[str, ...]] = (",
+        *(f'        "{col.name}",' for col in table.columns),
+        "    )",
+        "",
+        "    def to_row(self) -> tuple:",
+        "        return (",
+        *(f"            self.{col.name}," for col in table.columns),
+        "        )",
+        "",
+        "    @classmethod",
+        f'    def from_row(cls, row: Sequence) -> "{class_name}":',
+        "        return cls(",
+        *(f"            {row_value(col, position)}," for position, col in enumerate(table.columns)),
+        "        )",
+    ])
+
     return "\n".join(lines)
 
 
@@ -60,7 +86,7 @@ def main():
 
     init_lines = []
 
-    for table in TABLE_LIST:
+    for table in TABLE_LIST + VIEW_LIST:
         class_name = class_name_from_table(table.name)
         filename = f"{table.name}.py"
         file_path = os.path.join(models_dir, filename)
@@ -1,5 +1,8 @@
 import requests
 
+# maimai NET sends expired or invalid sessions to these pages instead of returning an error status
+SESSION_EXPIRED_PATHS = ("/maimai-mobile/error/", "/maimai-mobile/login/")
+
 
 def get_requests_session_from_driver(driver):
     session = requests.Session()
@@ -9,3 +12,8 @@ def get_requests_session_from_driver(driver):
         "User-Agent": driver.execute_script("return navigator.userAgent;")
     })
     return session
+
+
+def is_session_expired(response: requests.Response) -> bool:
+    """True if the request was redirected away from the requested page because the login is no longer valid"""
+    return any(path in response.url for path in SESSION_EXPIRED_PATHS)
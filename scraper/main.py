@@ -8,12 +8,15 @@ if not hasattr(threading.Thread, "isAlive"):
 
 import logging
 import sys
+from functools import partial
 
-from scraper.constants import Browser
-from scraper.driver.chrome_driver import get_chrome_driver
+from scraper.constants import Browser, Endpoints
+from scraper.driver.chrome_driver import get_chrome_driver, resolve_chromedriver_path
+from scraper.driver.driver_pool import DriverPool
 from scraper.exception.scraper_exception import ScraperError
 from scraper.resources.resource_manager import resources
 from scraper.scrapers.browser_scraper import BrowserScraper
+from scraper.utils.request_scheduler import RequestScheduler
 
 logger = logging.getLogger(__name__.split(".")[-1])
 
@@ -21,7 +24,11 @@ if __name__ == "__main__":
     try:
         if resources.config["BROWSER"].lower() == Browser.CHROME:
             logger.info("Its chrome")
-            scraper = BrowserScraper(resources.config, resources.database, get_chrome_driver())
+            scheduler = RequestScheduler.from_config(resources.config)
+            driver_path = resolve_chromedriver_path()
+            driver_factory = partial(get_chrome_driver, driver_path)
+            driver_pool = DriverPool.from_config(resources.config, driver_factory, scheduler, Endpoints.RECORDS)
+            scraper = BrowserScraper(resources.config, resources.database, driver_factory(), scheduler, driver_pool)
             scraper.scrape()
 
         if resources.config["BROWSER"].lower() == Browser.FIREFOX:
@@ -1,6 +1,7 @@
 import logging
 from dataclasses import asdict
 
+from scraper.metadata.migrations import MIGRATIONS
 from scraper.resources.database import Database
 from scraper.resources.database_schema import METADATA_TABLE
 from scraper.resources.models import Metadata
@@ -25,14 +26,26 @@ class MetadataManager:
     # Data stored versions
     # When the scraper changes the data structure
     # Should be rarely used
-    DATABASE_VERSION = 1
+    DATABASE_VERSION = 5
 
     def __init__(self, database: Database):
         self.database = database
+        self._run_migrations()
         self._initialize_update_metadata()
         self.version = self._load_cache()
         self._validate_schema()
 
+    def _run_migrations(self):
+        """Run the data migrations between the stored DATABASE_VERSION and the current one, oldest first"""
+        stored: Metadata = self.database.select(METADATA_TABLE, {}, entity_class=Metadata, limit=1)
+        if stored is None:
+            return  # New database, nothing to migrate
+
+        for version in sorted(MIGRATIONS):
+            if stored.database_version < version <= self.DATABASE_VERSION:
+                logger.info(f"Migrating database from version {version - 1} to {version}")
+                MIGRATIONS[version](self.database)
+
     def _validate_schema(self):
         # For future use
         pass
@@ -0,0 +1,81 @@
+import sqlite3
+from typing import Callable
+
+from scraper.constants import PlayedAt
+from scraper.resources.database import Database
+from scraper.resources.database_schema import (
+    PLAY_DATA_TABLE, SONG_DATA_TABLE, SONG_TABLE, CHART_TABLE, EXPORT_STATE_TABLE, PLAY_RECORD_VIEW
+)
+from scraper.utils import scraping_utils as su
+
+
+def _backfill_numeric_scores(database: Database) -> None:
+    """achievement_value, dx_score_value and dx_score_max of plays stored before they were parsed at ingest"""
+    database.backfill(
+        PLAY_DATA_TABLE,
+        ["achievement", "dx_score"],
+        ["achievement_value", "dx_score_value", "dx_score_max"],
+        lambda achievement, dx_score: (su.parse_achievement_value(achievement), *su.parse_dx_score(dx_score)),
+    )
+
+
+def _backfill_played_at_epoch(database: Database) -> None:
+    """played_at_epoch of plays stored before it was parsed at ingest, read in Japan Standard Time"""
+    database.backfill(
+        PLAY_DATA_TABLE,
+        ["played_at"],
+        ["played_at_epoch"],
+        lambda played_at: (su.parse_played_at(played_at, PlayedAt.FORMAT, PlayedAt.UTC_OFFSET_HOURS),),
+    )
+
+
+def _intern_charts(database: Database) -> None:
+    """Song and chart rows for every stored play and song score, and the ids referencing them"""
+
+    def intern(conn: sqlite3.Connection) -> None:
+        conn.execute(f"INSERT INTO {SONG_TABLE.name} (title, music_type) "
+                     f"SELECT DISTINCT title, music_type FROM {PLAY_DATA_TABLE.name} "
+                     f"WHERE title IS NOT NULL AND music_type IS NOT NULL ON CONFLICT DO NOTHING")
+        conn.execute(f"INSERT INTO {SONG_TABLE.name} (title, music_type) "
+                     f"SELECT DISTINCT song_title, song_type FROM {SONG_DATA_TABLE.name} "
+                     f"WHERE song_title IS NOT NULL AND song_type IS NOT NULL ON CONFLICT DO NOTHING")
+        conn.execute(f"INSERT INTO {CHART_TABLE.name} (song_id, difficulty) "
+                     f"SELECT DISTINCT {SONG_TABLE.name}.id, play.difficulty FROM {PLAY_DATA_TABLE.name} AS play "
+                     f"JOIN {SONG_TABLE.name} ON {SONG_TABLE.name}.title = play.title "
+                     f"AND {SONG_TABLE.name}.music_type = play.music_type "
+                     f"WHERE play.difficulty IS NOT NULL ON CONFLICT DO NOTHING")
+        conn.execute(f"UPDATE {PLAY_DATA_TABLE.name} AS play SET chart_id = ("
+                     f"SELECT {CHART_TABLE.name}.id FROM {CHART_TABLE.name} JOIN {SONG_TABLE.name} "
+                     f"ON {SONG_TABLE.name}.id = {CHART_TABLE.name}.song_id "
+                     f"WHERE title = play.title AND music_type = play.music_type "
+                     f"AND {CHART_TABLE.name}.difficulty = play.difficulty) "
+                     f"WHERE chart_id IS NULL")
+        conn.execute(f"UPDATE {SONG_DATA_TABLE.name} SET song_id = ("
+                     f"SELECT id FROM {SONG_TABLE.name} WHERE title = song_title AND music_type = song_type) "
+                     f"WHERE song_id IS NULL")
+
+    with database.unit_of_work() as uow:
+        uow.call(intern)
+
+
+def _drop_play_data_identity(database: Database) -> None:
+    """
+    Rebuild play_data without title, difficulty and music_type, now read through its chart (see PLAY_RECORD_VIEW).
+    Incremental exports of play_data continue from the view.
+    """
+    _intern_charts(database)  # Any play stored without its chart_id is interned before its title is dropped
+    database.rebuild_table(PLAY_DATA_TABLE)
+    with database.unit_of_work() as uow:
+        uow.call(lambda conn: conn.execute(f"UPDATE {EXPORT_STATE_TABLE.name} SET table_name = ? WHERE table_name = ?",
+                                           (PLAY_RECORD_VIEW.name, PLAY_DATA_TABLE.name)))
+    database.vacuum()
+
+
+# Data migrations by the DATABASE_VERSION they upgrade to. New columns themselves are added by Database on startup,
+# these fill them in for existing rows
+MIGRATIONS: dict[int, Callable[[Database], None]] = {
+    2: _backfill_numeric_scores,
+    3: _backfill_played_at_epoch,
+    4: _intern_charts,
+    5: _drop_play_data_identity,
+}
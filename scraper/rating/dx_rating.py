@@ -0,0 +1,218 @@
+import json
+import logging
+import math
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from sortedcontainers import SortedList
+
+from scraper.exception.scraper_exception import ScraperError
+from scraper.resources.database import Database
+from scraper.resources.database_schema import PLAY_RECORD_VIEW
+from scraper.resources.models import PlayRecord
+from scraper.utils import scraping_utils as su
+
+logger = logging.getLogger(__name__.split(".")[-1])
+
+# Achievement is capped at SSS+ for rating purposes
+MAX_ACHIEVEMENT = 100.5
+
+# (minimum achievement, rank factor), ascending. Achievements are shown to 4 decimals, the x.x999 rows are the
+# reduced factor the game gives a play exactly one step below the next rank
+RANK_FACTORS: list[tuple[float, float]] = [
+    (0.0, 0.0),
+    (10.0, 1.6),
+    (20.0, 3.2),
+    (30.0, 4.8),
+    (40.0, 6.4),
+    (50.0, 8.0),  # C
+    (60.0, 9.6),  # B
+    (70.0, 11.2),  # BB
+    (75.0, 12.0),  # BBB
+    (79.9999, 12.8),
+    (80.0, 13.6),  # A
+    (90.0, 15.2),  # AA
+    (94.0, 16.8),  # AAA
+    (96.9999, 17.6),
+    (97.0, 20.0),  # S
+    (98.0, 20.3),  # S+
+    (98.9999, 20.6),
+    (99.0, 20.8),  # SS
+    (99.5, 21.1),  # SS+
+    (99.9999, 21.4),
+    (100.0, 21.6),  # SSS
+    (100.4999, 22.2),
+    (100.5, 22.4),  # SSS+
+]
+_RANK_THRESHOLDS = [threshold for threshold, _ in RANK_FACTORS]
+
+ChartKey = tuple[str, str, str]  # (title, difficulty, music_type)
+
+
+def chart_key(title: str, difficulty: str, music_type: str) -> ChartKey:
+    """Normalized chart identity, so the data file does not have to match the page's casing"""
+    return title.strip(), difficulty.strip().upper(), music_type.strip().lower()
+
+
+def play_rating(constant: float, achievement: float) -> int:
+    """Rating of a single play: floor(constant * min(achievement, 100.5) * rank factor / 100)"""
+    achievement = min(achievement, MAX_ACHIEVEMENT)
+    factor = RANK_FACTORS[max(0, bisect_right(_RANK_THRESHOLDS, achievement) - 1)][1]
+    # Rounded first so that e.g. 14.7 * 100.5 does not floor one below because of float error
+    return math.floor(round(constant * achievement * factor / 100, 6))
+
+
+@dataclass(frozen=True)
+class ChartConstant:
+    constant: float
+    new: bool  # Chart from the current version, rated in the "new" pool
+
+
+class ChartConstants:
+    """
+    Chart constants read from a local JSON file, a list of objects such as:
+
+        {"title": "Song", "difficulty": "MASTER", "music_type": "dx", "constant": 13.7, "new": false}
+
+    "new" marks charts of the current game version. Lookups are a single dict access.
+    """
+
+    def __init__(self, constants: dict[ChartKey, ChartConstant]) -> None:
+        self._constants = constants
+
+    @classmethod
+    def from_file(cls, path: str) -> "ChartConstants":
+        try:
+            with open(path, encoding="utf-8") as f:
+                entries = json.load(f)
+            constants = {
+                chart_key(entry["title"], entry["difficulty"], entry["music_type"]):
+                    ChartConstant(float(entry["constant"]), bool(entry.get("new", False)))
+                for entry in entries
+            }
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            raise ScraperError(f"Failed to load chart constants from {path}: {e}")
+        logger.info(f"Loaded {len(constants)} chart constants from {path}")
+        return cls(constants)
+
+    def get(self, key: ChartKey) -> Optional[ChartConstant]:
+        return self._constants.get(key)
+
+    def __len__(self) -> int:
+        return len(self._constants)
+
+
+@dataclass(frozen=True, order=True)
+class ChartRating:
+    """Best play of a chart. Ordered by rating, then achievement, so the highest sort last"""
+    rating: int
+    achievement: float
+    key: ChartKey
+    constant: float
+
+
+def _descending(entry: ChartRating) -> tuple:
+    return -entry.rating, -entry.achievement, entry.key
+
+
+class TopRatings:
+    """
+    Every chart's best rating in one pool, sorted, with the sum of the top `size` kept up to date on each change.
+    Changes are O(log n), reading the sum is O(1).
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.total = 0
+        self._entries = SortedList(key=_descending)
+
+    def add(self, entry: ChartRating) -> None:
+        self._entries.add(entry)
+        if self._entries.index(entry) < self.size:
+            self.total += entry.rating
+            if len(self._entries) > self.size:
+                # Pushed out of the top
+                self.total -= self._entries[self.size].rating
+
+    def remove(self, entry: ChartRating) -> None:
+        if self._entries.index(entry) < self.size:
+            self.total -= entry.rating
+            if len(self._entries) > self.size:
+                # Moves into the top
+                self.total += self._entries[self.size].rating
+        self._entries.remove(entry)
+
+    def top(self) -> list[ChartRating]:
+        return list(self._entries.islice(0, self.size))
+
+
+class RatingEngine:
+    """
+    DX rating kept up to date play by play: the best play of every chart, split between the current version's
+    charts (best `new_size`) and older ones (best `old_size`).
+
+    Feeding a play is O(log charts) and only changes anything when it beats the chart's best. Plays of charts that
+    are missing from the chart constants are ignored.
+    """
+
+    def __init__(self, constants: ChartConstants, old_size: int = 35, new_size: int = 15) -> None:
+        self.constants = constants
+        self._best: dict[ChartKey, ChartRating] = {}
+        self._old = TopRatings(old_size)
+        self._new = TopRatings(new_size)
+        self._unknown_charts: set[ChartKey] = set()
+
+    @property
+    def rating(self) -> int:
+        return self._old.total + self._new.total
+
+    def update(self, play: PlayRecord) -> bool:
+        """
+        Args:
+            play (PlayRecord): Any play, detailed or not.
+
+        Returns:
+            bool: True if the play is the new best of its chart
+        """
+        achievement = su.parse_achievement(play.achievement)
+        if achievement is None or not play.title or not play.difficulty or not play.music_type:
+            return False
+
+        key = chart_key(play.title, play.difficulty, play.music_type)
+        chart = self.constants.get(key)
+        if chart is None:
+            if key not in self._unknown_charts:
+                self._unknown_charts.add(key)
+                logger.debug(f"No chart constant for {key}, not rated")
+            return False
+
+        entry = ChartRating(play_rating(chart.constant, achievement), achievement, key, chart.constant)
+        previous = self._best.get(key)
+        if previous is not None and previous >= entry:
+            return False
+
+        pool = self._new if chart.new else self._old
+        if previous is not None:
+            pool.remove(previous)
+        pool.add(entry)
+        self._best[key] = entry
+        return True
+
+    def update_all(self, plays: Iterable[PlayRecord]) -> int:
+        """Feed plays in any order. Returns the number of chart bests that changed"""
+        return sum(self.update(play) for play in plays)
+
+    def load(self, database: Database) -> None:
+        """Feed every stored play, streamed from the database"""
+        self.update_all(database.iter_select(PLAY_RECORD_VIEW, None, PlayRecord, chunk_size=5000))
+        logger.info(f"Rating {self.rating} over {len(self._best)} rated chart(s)")
+
+    def best_old(self) -> list[ChartRating]:
+        return self._old.top()
+
+    def best_new(self) -> list[ChartRating]:
+        return self._new.top()
+
+    def __repr__(self):
+        return f"RatingEngine(rating={self.rating}, charts={len(self._best)}, constants={len(self.constants)})"
@@ -0,0 +1,162 @@
+import logging
+import sqlite3
+from typing import Optional, Iterable
+
+from scraper.resources.database import Database, UnitOfWork
+from scraper.resources.database_schema import SONG_TABLE, CHART_TABLE
+from scraper.resources.models import Song, PlayRecord, SongData
+
+logger = logging.getLogger(__name__.split(".")[-1])
+
+ChartKey = tuple[str, str, str]  # (title, music_type, difficulty)
+
+# Rows per lookup of newly stored songs or charts, up to 3 parameters each, well under SQLite's bound parameter limit
+_LOOKUP_CHUNK_SIZE = 300
+
+
+class ChartRegistry:
+    """
+    Interns song and chart identities: (title, music_type) -> song id and (title, music_type, difficulty) -> chart
+    id, storing a new row the first time one is seen.
+
+    Every stored id is loaded in one pass on first use, after which resolving a play is a dict lookup. Unknown songs
+    and charts are stored in bulk, inside the unit of work writing the rows that reference them, so a failed write
+    leaves none behind. Use it from the thread that owns the Database.
+    """
+
+    def __init__(self, database: Database) -> None:
+        self.database = database
+        self._songs: Optional[dict[tuple[str, str], int]] = None
+        self._charts: dict[ChartKey, int] = {}
+
+    def _load(self) -> None:
+        self._songs = {(song.title, song.music_type): song.id
+                       for song in self.database.iter_select(SONG_TABLE, None, Song)}
+        with self.database.reader() as conn:
+            self._charts = {(title, music_type, difficulty): chart_id for chart_id, title, music_type, difficulty in
+                            conn.execute(f"SELECT {CHART_TABLE.name}.id, title, music_type, difficulty "
+                                         f"FROM {CHART_TABLE.name} JOIN {SONG_TABLE.name} "
+                                         f"ON {SONG_TABLE.name}.id = {CHART_TABLE.name}.song_id")}
+        logger.info(f"Loaded {len(self._songs)} songs and {len(self._charts)} charts")
+
+    def assign_charts(self, uow: UnitOfWork, records: Iterable[PlayRecord]) -> list[PlayRecord]:
+        """
+        Set the chart_id of every record from its title, music_type and difficulty.
+
+        Known charts are assigned right away. Unknown ones are stored, and assigned, when the unit of work commits,
+        so call this before queueing the records themselves.
+
+        Returns:
+            list[PlayRecord]: The records that have a chart, in the given order. Records missing any part of its
+            identity are left out with a warning: play_data keeps nothing else of what was played, so they must not
+            be stored.
+        """
+        if self._songs is None:
+            self._load()
+
+        identified = []
+        pending: dict[ChartKey, list[PlayRecord]] = {}
+        for record in records:
+            if not record.title or not record.music_type or not record.difficulty:
+                logger.warning(f"Play {record.idx} has no title, music type or difficulty, not stored")
+                continue
+            identified.append(record)
+            key = (record.title, record.music_type, record.difficulty)
+            chart_id = self._charts.get(key)
+            if chart_id is None:
+                pending.setdefault(key, []).append(record)
+            else:
+                record.chart_id = chart_id
+        if not pending:
+            return identified
+
+        stored: dict[ChartKey, tuple[int, int]] = {}  # chart id, song id
+
+        def store(conn: sqlite3.Connection) -> None:
+            conn.executemany(f"INSERT INTO {SONG_TABLE.name} (title, music_type) VALUES (?, ?) ON CONFLICT DO NOTHING",
+                             {(title, music_type) for title, music_type, _ in pending})
+            conn.executemany(f"INSERT INTO {CHART_TABLE.name} (song_id, difficulty) "
+                             f"SELECT id, ? FROM {SONG_TABLE.name} WHERE title = ? AND music_type = ? "
+                             f"ON CONFLICT DO NOTHING",
+                             [(difficulty, title, music_type) for title, music_type, difficulty in pending])
+            stored.update(self._lookup(conn, list(pending)))
+            for key, chart_records in pending.items():
+                for record in chart_records:
+                    record.chart_id = stored[key][0]
+
+        def cache() -> None:
+            for (title, music_type, difficulty), (chart_id, song_id) in stored.items():
+                self._charts[(title, music_type, difficulty)] = chart_id
+                self._songs[(title, music_type)] = song_id
+            logger.debug(f"Stored {len(stored)} new chart(s)")
+
+        uow.call(store)
+        uow.on_commit(cache)
+        return identified
+
+    @staticmethod
+    def _lookup(conn: sqlite3.Connection, keys: list[ChartKey]) -> dict[ChartKey, tuple[int, int]]:
+        ids = {}
+        for start in range(0, len(keys), _LOOKUP_CHUNK_SIZE):
+            chunk = keys[start:start + _LOOKUP_CHUNK_SIZE]
+            rows = conn.execute(
+                f"SELECT {CHART_TABLE.name}.id, song_id, title, music_type, difficulty "
+                f"FROM {CHART_TABLE.name} JOIN {SONG_TABLE.name} ON {SONG_TABLE.name}.id = {CHART_TABLE.name}.song_id "
+                f"WHERE (title, music_type, difficulty) IN (VALUES {', '.join(['(?, ?, ?)'] * len(chunk))})",
+                [value for key in chunk for value in key],
+            )
+            ids.update({(title, music_type, difficulty): (chart_id, song_id)
+                        for chart_id, song_id, title, music_type, difficulty in rows})
+        return ids
+
+    def assign_songs(self, uow: UnitOfWork, song_data: Iterable[SongData]) -> None:
+        """
+        Set the song_id of every song score still missing one, from its song_title and song_type. Scores missing
+        either are left unchanged.
+
+        Known songs are assigned right away. Unknown ones are stored, and assigned, when the unit of work commits,
+        so call this before queueing the scores themselves.
+        """
+        if self._songs is None:
+            self._load()
+
+        pending: dict[tuple[str, str], list[SongData]] = {}
+        for score in song_data:
+            if score.song_id is not None or not score.song_title or not score.song_type:
+                continue
+            key = (score.song_title, score.song_type)
+            song_id = self._songs.get(key)
+            if song_id is None:
+                pending.setdefault(key, []).append(score)
+            else:
+                score.song_id = song_id
+        if not pending:
+            return
+
+        stored: dict[tuple[str, str], int] = {}
+
+        def store(conn: sqlite3.Connection) -> None:
+            conn.executemany(f"INSERT INTO {SONG_TABLE.name} (title, music_type) VALUES (?, ?) ON CONFLICT DO NOTHING",
+                             list(pending))
+            keys = list(pending)
+            for start in range(0, len(keys), _LOOKUP_CHUNK_SIZE):
+                chunk = keys[start:start + _LOOKUP_CHUNK_SIZE]
+                rows = conn.execute(
+                    f"SELECT id, title, music_type FROM {SONG_TABLE.name} "
+                    f"WHERE (title, music_type) IN (VALUES {', '.join(['(?, ?)'] * len(chunk))})",
+                    [value for key in chunk for value in key],
+                )
+                stored.update({(title, music_type): song_id for song_id, title, music_type in rows})
+            for key, scores in pending.items():
+                for score in scores:
+                    score.song_id = stored[key]
+
+        def cache() -> None:
+            self._songs.update(stored)
+            logger.debug(f"Stored {len(stored)} new song(s)")
+
+        uow.call(store)
+        uow.on_commit(cache)
+
+    def __len__(self) -> int:
+        return len(self._charts)
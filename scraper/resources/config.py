@@ -68,6 +68,18 @@ class Config:
         value = self.get(key, default)
         return int(value)
 
+    def get_float(self, key: str, default: float = None) -> float:
+        value = self.get(key, default)
+        return float(value)
+
+    def get_bool(self, key: str, default: bool = None) -> bool:
+        value = self._values.get(key)
+        if value is None:
+            if default is None:
+                raise ScraperError(f"Missing required config: {key}")
+            return default
+        return value.strip().lower() in ("1", "true", "yes", "on")
+
     @property
     def logging_level(self) -> str:
         return self.get("LOGGING").upper()
@@ -92,16 +104,36 @@ class Config:
 
         ### Do not touch the section below unless you know what you are doing
         
+        MIN_CHECK_INTERVAL_SECONDS=30
         CHECK_INTERVAL_MINUTES=5
+        MAX_CHECK_INTERVAL_MINUTES=60
+        CHECK_INTERVAL_BACKOFF=2
         LOGGING=INFO
         UI_WAIT_DELAY=5
         UI_WAIT_TIMEOUT=15
+        USE_HTTP_CLIENT=false
+        DETAIL_FETCH_CONCURRENCY=3
+        REQUESTS_PER_SECOND=0.5
+        REQUEST_BURST=3
+        CHART_CONSTANTS_FILE=chart_constants.json
+        SCRAPE_SONG_SCORES=false
+        DRIVER_POOL_SIZE=0
+        DRIVER_POOL_RECYCLE_AFTER=200
 
         # These credentials are stored locally only.
         # They are never sent anywhere except to log in to maimai website
         # REGION should be one of the following: jp, japan, intl, international
         # BROWSER should be one of the following: chrome, firefox, headless
         # LANGUAGE should be one of the following: en, ja
+        # Records are checked every MIN_CHECK_INTERVAL_SECONDS while new plays keep showing up. Once idle, checks start
+        # at CHECK_INTERVAL_MINUTES and slow down by CHECK_INTERVAL_BACKOFF for every idle check up to
+        # MAX_CHECK_INTERVAL_MINUTES
+        # REQUESTS_PER_SECOND and REQUEST_BURST limit page loads across all tabs and HTTP requests combined
+        # USE_HTTP_CLIENT=true only uses the browser to log in, pages are then fetched and parsed without rendering
+        # CHART_CONSTANTS_FILE (next to this file) enables DX rating calculation, see scraper/rating/dx_rating.py
+        # SCRAPE_SONG_SCORES=true refreshes the best score of every song and difficulty once at startup
+        # DRIVER_POOL_SIZE extra browsers load detail and score pages in parallel, sharing the login (0 = disabled).
+        # Each is restarted after DRIVER_POOL_RECYCLE_AFTER pages
         """)
 
         logger.info("No existing config found. Creating default config file.")
@@ -0,0 +1,139 @@
+import logging
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional, Iterator
+
+from scraper.exception.scraper_exception import ScraperError
+
+logger = logging.getLogger(__name__.split(".")[-1])
+
+
+class ConnectionManager:
+    """
+    Owns the SQLite connections to one database file: a single writer connection and a pool of read-only connections.
+
+    The database is switched to WAL journaling so readers (other threads, dashboards or scripts in other processes)
+    never block the writer and the writer never blocks them. Writes stay serialized because only the writer
+    connection can write, and it may only be used from the thread that opened it.
+    """
+
+    # Applied to every connection
+    CONNECTION_PRAGMAS = {
+        "synchronous": "NORMAL",  # Durable in WAL mode, skips the fsync on every commit
+        "cache_size": -16000,  # 16 MB page cache (negative = KiB)
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,  # ms to wait on a lock held by another process, e.g. during a checkpoint
+        "foreign_keys": "ON",  # Enforce the REFERENCES declared in database_schema.py
+    }
+
+    def __init__(self, db_path: str, read_pool_size: int = 4) -> None:
+        """
+        Args:
+            db_path (str): Path to the SQLite database file.
+            read_pool_size (int): Maximum number of read-only connections kept open.
+        """
+        self._db_path = db_path
+        self._read_pool_size = read_pool_size
+        self._writer: Optional[sqlite3.Connection] = None
+        self._readers: queue.Queue[sqlite3.Connection] = queue.Queue()
+        self._reader_count = 0
+        self._reader_lock = threading.Lock()
+
+    @property
+    def writer_open(self) -> bool:
+        return self._writer is not None
+
+    def writer(self) -> sqlite3.Connection:
+        """
+        Get the writer connection, opening it (and enabling WAL) if needed.
+        Must only be used from the thread that opened it.
+        """
+        if self._writer is None:
+            try:
+                connection = sqlite3.connect(self._db_path, cached_statements=256)
+                connection.row_factory = sqlite3.Row
+                journal_mode = connection.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+                self._apply_pragmas(connection)
+                self._writer = connection
+                logger.info(f"Writer connection opened to {self._db_path} (journal mode : {journal_mode})")
+            except sqlite3.Error as e:
+                raise ScraperError(f"Failed to open database connection: {e}")
+        return self._writer
+
+    @contextmanager
+    def reader(self, timeout: Optional[float] = None) -> Iterator[sqlite3.Connection]:
+        """
+        Borrow a read-only connection from the pool. Safe to use from any thread, the connection is returned to the
+        pool when the block exits.
+
+        Args:
+            timeout (float, optional): Seconds to wait for a free connection when the pool is exhausted.
+                Waits forever if None.
+        """
+        connection = self._acquire_reader(timeout)
+        try:
+            yield connection
+        finally:
+            if connection.in_transaction:
+                connection.rollback()
+            self._readers.put(connection)
+
+    def _acquire_reader(self, timeout: Optional[float]) -> sqlite3.Connection:
+        try:
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._reader_lock:
+            can_open = self._reader_count < self._read_pool_size
+            if can_open:
+                self._reader_count += 1
+        if not can_open:
+            try:
+                return self._readers.get(timeout=timeout)
+            except queue.Empty:
+                raise ScraperError(f"No read connection available after {timeout} seconds")
+
+        try:
+            uri = f"{Path(self._db_path).absolute().as_uri()}?mode=ro"
+            connection = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            connection.row_factory = sqlite3.Row
+            self._apply_pragmas(connection)
+            connection.execute("PRAGMA query_only=ON")
+            logger.debug(f"Read-only connection opened to {self._db_path}")
+            return connection
+        except sqlite3.Error as e:
+            with self._reader_lock:
+                self._reader_count -= 1
+            raise ScraperError(f"Failed to open read-only database connection: {e}")
+
+    def _apply_pragmas(self, connection: sqlite3.Connection) -> None:
+        for pragma, value in self.CONNECTION_PRAGMAS.items():
+            connection.execute(f"PRAGMA {pragma}={value}")
+
+    def close(self) -> None:
+        """Closes the writer and every pooled read-only connection."""
+        if self._writer is not None:
+            try:
+                self._writer.close()
+                logger.info("Writer connection closed.")
+            except sqlite3.Error as e:
+                logger.error(f"Error closing writer connection: {e}")
+            finally:
+                self._writer = None
+
+        while True:
+            try:
+                connection = self._readers.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                connection.close()
+            except sqlite3.Error as e:
+                logger.error(f"Error closing read-only connection: {e}")
+            with self._reader_lock:
+                self._reader_count -= 1
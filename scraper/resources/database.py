@@ -1,11 +1,15 @@
 import logging
 import sqlite3
-from dataclasses import asdict, is_dataclass, fields
-from typing import Optional, Any, Union, Type, TypeVar
+from contextlib import contextmanager
+from dataclasses import asdict, is_dataclass, fields, Field, replace
+from functools import lru_cache
+from typing import Optional, Any, Union, Type, TypeVar, Iterator, Callable, Sequence, Iterable
 
 from scraper.exception.scraper_exception import ScraperError
-from scraper.resources.database_schema import TABLE_LIST, Table
-from scraper.resources.models import PlayData, SongData
+from scraper.resources.connection_manager import ConnectionManager
+from scraper.resources.database_schema import TABLE_LIST, VIEW_LIST, Table, PLAY_DATA_TABLE, PLAY_RECORD_VIEW
+from scraper.resources.models import PlayData, PlayRecord, SongData
+from scraper.resources.statement_cache import StatementCache
 from scraper.utils.path_resolver import resolve_app_file_path
 
 logger = logging.getLogger(__name__.split(".")[-1])
@@ -13,61 +17,203 @@ logger = logging.getLogger(__name__.split(".")[-1])
 T = TypeVar("T")  # Generic type variable for dataclass
 
 
+def _is_bool_field(field: Field) -> bool:
+    """runtime-safe check for bool and Optional[bool]"""
+    field_type = field.type
+    origin = getattr(field_type, "__origin__", None)
+    args = getattr(field_type, "__args__", ())
+    return field_type is bool or (origin is Union and bool in args and type(None) in args)
+
+
+@lru_cache(maxsize=None)
+def _row_mapper(entity_class: Type[T], columns: tuple[str, ...]) -> Callable[[Sequence], T]:
+    """
+    Build (once per entity class and result column set) a function mapping a plain row tuple to the entity.
+
+    Column positions and int -> bool coercions are resolved here, so mapping a row only touches the values.
+    Result columns that are not fields of the entity are ignored.
+    """
+    if columns == getattr(entity_class, "COLUMNS", None):
+        # Generated models decode their own table rows
+        return entity_class.from_row
+
+    entity_fields = {field.name: field for field in fields(entity_class)}
+    positions = [position for position, column in enumerate(columns) if column in entity_fields]
+    names = [columns[position] for position in positions]
+    bool_indexes = [index for index, name in enumerate(names) if _is_bool_field(entity_fields[name])]
+    init_names = [field.name for field in fields(entity_class) if field.init]
+
+    all_positions = positions == list(range(len(columns)))
+
+    if names == init_names:
+        # Result columns line up with the constructor, build straight from the values
+        if all_positions and not bool_indexes:
+            return lambda row: entity_class(*row)
+
+        def map_positional(row: Sequence) -> T:
+            values = list(row) if all_positions else [row[position] for position in positions]
+            for index in bool_indexes:
+                if values[index] is not None:
+                    values[index] = bool(values[index])
+            return entity_class(*values)
+
+        return map_positional
+
+    def map_keywords(row: Sequence) -> T:
+        values = [row[position] for position in positions]
+        for index in bool_indexes:
+            if values[index] is not None:
+                values[index] = bool(values[index])
+        return entity_class(**dict(zip(names, values)))
+
+    return map_keywords
+
+
+class UnitOfWork:
+    """
+    Collects inserts, upserts and steps, and runs them in a single transaction.
+    Consecutive rows using the same statement are sent with one executemany call.
+
+    Entities are only read when the unit of work commits, so a step queued before them (see call()) can still fill in
+    their values. Obtain one through Database.unit_of_work(). Auto-generated ids are not written back to the entities.
+    """
+
+    def __init__(self, database: "Database") -> None:
+        self._database = database
+        # (sql, binder, entities) batches and steps, in the order they were added
+        self._operations: list[Union[tuple[str, Callable[[Any], tuple], list], Callable]] = []
+        self._on_commit: list[Callable[[], None]] = []
+
+    def __len__(self) -> int:
+        return sum(len(operation[2]) for operation in self._operations if isinstance(operation, tuple))
+
+    def insert(self, table: Table, entity: Any) -> None:
+        """Queue an insert. See Database.insert"""
+        if not is_dataclass(entity):
+            raise TypeError("Entity must be a dataclass instance")
+
+        self._add(*self._database.statements.plan_insert(table, type(entity)), entity)
+
+    def upsert(self, table: Table, entity: Any) -> None:
+        """Queue an upsert. See Database.upsert"""
+        if not is_dataclass(entity):
+            raise TypeError("Entity must be a dataclass instance")
+
+        self._add(*self._database.statements.plan_upsert(table, entity), entity)
+
+    def call(self, step: Callable[[sqlite3.Connection], None]) -> None:
+        """
+        Queue a function run with the writer connection, inside the transaction, after everything queued before it.
+        What it writes is committed or rolled back with the rest.
+        """
+        self._operations.append(step)
+
+    def on_commit(self, callback: Callable[[], None]) -> None:
+        """Run once the transaction committed, e.g. to cache what a step wrote. Dropped if it rolls back"""
+        self._on_commit.append(callback)
+
+    def _add(self, sql: str, bind: Callable[[Any], tuple], entity: Any) -> None:
+        last = self._operations[-1] if self._operations else None
+        if isinstance(last, tuple) and last[0] == sql and last[1] is bind:
+            last[2].append(entity)
+        else:
+            self._operations.append((sql, bind, [entity]))
+
+    def commit(self) -> None:
+        """
+        Run every queued operation in one transaction. Rolls back everything if any of them fails.
+
+        Raises:
+            ScraperError: If the transaction failed and was rolled back.
+        """
+        if not self._operations:
+            return
+
+        conn = self._database._get_active_connection()
+        rows = len(self)
+        callbacks = self._on_commit  # Steps may still add to it
+        changes_before = conn.total_changes  # Also counts what the steps wrote
+        try:
+            with conn:  # Commits on success, rolls back on exception
+                for operation in self._operations:
+                    if isinstance(operation, tuple):
+                        sql, bind, entities = operation
+                        logger.debug(f"Writing {len(entities)} row(s) using the following SQL query : \n{sql}")
+                        conn.executemany(sql, map(bind, entities))
+                    else:
+                        operation(conn)
+        except sqlite3.Error as e:
+            raise ScraperError(f"Transaction rolled back, {rows} row(s) discarded due to {e}")
+        finally:
+            self._operations = []
+            self._on_commit = []
+        written = conn.total_changes - changes_before
+        logger.log(logging.INFO if written else logging.DEBUG, f"Committed {written} row(s) in one transaction")
+        for callback in callbacks:
+            callback()
+
+    def rollback(self) -> None:
+        """Discard every queued operation"""
+        self._operations.clear()
+        self._on_commit.clear()
+
+
 class Database:
     """
     Manages the SQLite database connection and schema initialization for the MaiMai scraper.
     """
 
-    def __init__(self, db_name: str = "maimai_data.db") -> None:
+    def __init__(self, db_name: str = "maimai_data.db", read_pool_size: int = 4) -> None:
         """
         Initializes the Database.
 
         Args:
             db_name (str): The name of the SQLite database file. Defaults to "maimai_data.db".
+            read_pool_size (int): Maximum number of pooled read-only connections, see reader().
         """
         self._db_name: str = db_name
         self._db_path: str = resolve_app_file_path(filename=self._db_name)
-        self._connection: Optional[sqlite3.Connection] = None  # Persistent connection held by the object
+        # Single (persistent) writer connection plus the read-only pool
+        self._connections = ConnectionManager(self._db_path, read_pool_size)
+        # Generated SQL, built once per table and column set
+        self.statements = StatementCache()
 
         logger.info(f"Initializing database schemas for {self._db_path}")
         self._initialize_database()
 
     def _open_connection(self) -> sqlite3.Connection:
         """
-        Establishes and stores a persistent connection to the SQLite database
-        within the DatabaseManager object. If a connection is already open, it returns it.
+        Establishes the persistent writer connection to the SQLite database. If it is already open, it returns it.
         """
-        if self._connection is None:
-            try:
-                self._connection = sqlite3.connect(self._db_path)
-                self._connection.row_factory = sqlite3.Row
-                logger.info(f"Persistent connection opened to {self._db_path}")
-            except sqlite3.Error as e:
-                raise ScraperError(f"Failed to open database connection: {e}")
-        return self._connection
+        return self._connections.writer()
 
     def close_connection(self) -> None:
         """
-        Closes the persistent database connection if it is open.
+        Closes the persistent writer connection and every pooled read-only connection.
         """
-        if self._connection:
-            try:
-                self._connection.close()
-                logger.info("Persistent connection closed.")
-            except sqlite3.Error as e:
-                logger.error(f"Error closing persistent connection: {e}")
-            finally:
-                self._connection = None
+        self._connections.close()
 
     def _get_active_connection(self) -> sqlite3.Connection:
         """
-        Get the currently active (persistent) connection.
+        Get the currently active (persistent) writer connection.
         If no persistent connection is open, it will attempt to open one.
         """
-        if self._connection is None:
+        if not self._connections.writer_open:
             logger.info("Persistent connection not open. Attempting to open now.")
-            self._open_connection()  # Attempt to open if not already.
-        return self._connection
+        return self._open_connection()
+
+    @contextmanager
+    def reader(self, timeout: Optional[float] = None) -> Iterator[sqlite3.Connection]:
+        """
+        Borrow a pooled read-only connection. Unlike the writer connection, it can be used from any thread, and
+        reads do not block (and are not blocked by) the scraper's writes.
+
+        Example:
+            with database.reader() as conn:
+                conn.execute("SELECT COUNT(*) FROM play_data").fetchone()
+        """
+        with self._connections.reader(timeout) as connection:
+            yield connection
 
     def _object_exists(self, name: str, obj_type: str) -> bool:
         """
@@ -94,6 +240,31 @@ class Database:
         logger.debug(f"{obj_type} [{name}] exists: {exists}")
         return exists
 
+    def _unique_index_exists(self, table_name: str, columns: list[str]) -> bool:
+        """
+        Check if a table already has a UNIQUE constraint or unique index over exactly the given columns.
+
+        Args:
+            table_name (str): Name of the table
+            columns (list[str]): Columns of the constraint, in order
+
+        Returns:
+            bool: True if such a unique index exists, False otherwise
+        """
+        conn = self._get_active_connection()
+        for index in conn.execute(f"PRAGMA index_list({table_name})").fetchall():
+            if not index["unique"]:
+                continue
+            index_columns = [info["name"] for info in conn.execute(f"PRAGMA index_info({index['name']})")]
+            if index_columns == columns:
+                return True
+        return False
+
+    def _column_names(self, table_name: str) -> set[str]:
+        """Names of the columns the table currently has in the database file"""
+        conn = self._get_active_connection()
+        return {info["name"] for info in conn.execute(f"PRAGMA table_info({table_name})")}
+
     def _initialize_database(self) -> None:
         """
         Initializes the database schema by creating necessary tables and indexes
@@ -103,45 +274,157 @@ class Database:
         database_schema.py
         """
         conn = self._get_active_connection()
+        logger.info("Initializing database schema from Python definitions...")
+        for table in TABLE_LIST:
+            # Check if it already exists
+            if not self._object_exists(table.name, "table"):
+                create_table_sql = table.generate_create_table_sql()
+                logger.debug(f"Creating [{table.name}] using the following SQL query : \n{create_table_sql}")
+                self._execute_schema_change(create_table_sql)
+                logger.debug(f"[{table.name}] created")
+            else:
+                # Tables created by an older version get the columns declared since
+                existing_columns = self._column_names(table.name)
+                for column in table.columns:
+                    if column.name not in existing_columns:
+                        add_column_sql = table.generate_add_column_sql(column)
+                        logger.info(f"Adding column [{column.name}] to [{table.name}] using : {add_column_sql}")
+                        self._execute_schema_change(add_column_sql)
+
+            # Tables created before a unique constraint was declared get it as a unique index
+            for constraint_columns in table.unique_constraints:
+                if not self._unique_index_exists(table.name, constraint_columns):
+                    self._remove_duplicates(table, constraint_columns)
+                    constraint_sql = table.generate_create_unique_constraint_sql(constraint_columns)
+                    logger.debug(f"Adding unique constraint to [{table.name}] using : {constraint_sql}")
+                    self._execute_schema_change(constraint_sql)
+
+            # Create indexes
+            for index in table.indexes:
+                if not self._object_exists(index["name"], "index"):
+                    generated_index_sql = table.generate_create_index_sql(index)
+                    logger.debug(
+                        f"Creating index for [{table.name}] using the following SQL query : {generated_index_sql}")
+                    self._execute_schema_change(generated_index_sql)
+                    logger.debug(f'[{index["name"]}] created')
+
+        self._create_views()
+        conn.commit()
+        logger.info(f"Database schema initialized successfully at: {self._db_path}")
+
+    def _create_views(self) -> None:
+        """(Re)create every view, so they follow the columns of the tables they read"""
+        for view in VIEW_LIST:
+            self._execute_schema_change(f"DROP VIEW IF EXISTS {view.name}")
+            self._execute_schema_change(view.generate_create_view_sql())
+
+    def rebuild_table(self, table: Table) -> None:
+        """
+        Recreate a table from its declaration in database_schema.py, keeping the data of the columns still declared.
+        Needed to drop columns, which SQLite cannot do in place for NOT NULL, UNIQUE or indexed ones.
+
+        Done in one transaction with foreign key enforcement suspended, as SQLite documents for schema changes.
+
+        Raises:
+            ScraperError: If the rebuild failed and was rolled back
+        """
+        conn = self._get_active_connection()
+        conn.commit()
+        existing_columns = self._column_names(table.name)
+        columns = ", ".join(col.name for col in table.columns if col.name in existing_columns)
+        rebuilt = replace(table, name=f"{table.name}_rebuild")
+
+        conn.execute("PRAGMA foreign_keys = OFF")
         try:
-            cursor = conn.cursor()
-            logger.info("Initializing database schema from Python definitions...")
-            for table in TABLE_LIST:
-                # Check if it already exists
-                if not self._object_exists(table.name, "table"):
-                    create_table_sql = table.generate_create_table_sql()
-                    logger.debug(f"Creating [{table.name}] using the following SQL query : \n{create_table_sql}")
-                    cursor.execute(create_table_sql)
-                    logger.debug(f"[{table.name}] created")
-
-                # Create indexes
+            with conn:
+                conn.execute("BEGIN")
+                # Views are checked when a table they read is renamed
+                for view in VIEW_LIST:
+                    conn.execute(f"DROP VIEW IF EXISTS {view.name}")
+                conn.execute(rebuilt.generate_create_table_sql())
+                conn.execute(f"INSERT INTO {rebuilt.name} ({columns}) SELECT {columns} FROM {table.name}")
+                conn.execute(f"DROP TABLE {table.name}")
+                conn.execute(f"ALTER TABLE {rebuilt.name} RENAME TO {table.name}")
                 for index in table.indexes:
-                    if not self._object_exists(index["name"], "index"):
-                        generated_index_sql = table.generate_create_index_sql(index)
-                        logger.debug(
-                            f"Creating index for [{table.name}] using the following SQL query : {generated_index_sql}")
-                        cursor.execute(generated_index_sql)
-                        logger.debug(f'[{index["name"]}] created')
+                    conn.execute(table.generate_create_index_sql(index))
+                self._create_views()
+                violations = conn.execute(f"PRAGMA foreign_key_check({table.name})").fetchall()
+                if violations:
+                    raise ScraperError(f"{len(violations)} row(s) of [{table.name}] reference missing rows")
+        except sqlite3.Error as e:
+            raise ScraperError(f"Failed to rebuild [{table.name}] : {e}")
+        finally:
+            conn.execute("PRAGMA foreign_keys = ON")
+        logger.info(f"Rebuilt [{table.name}] with columns {columns}")
 
-            conn.commit()
-            logger.info(f"Database schema initialized successfully at: {self._db_path}")
+    def vacuum(self) -> None:
+        """Shrink the database file to the pages still in use, e.g. after a table was rebuilt"""
+        conn = self._get_active_connection()
+        conn.commit()
+        conn.execute("VACUUM")
+
+    def _execute_schema_change(self, sql: str) -> None:
+        """
+        Run one schema statement. A failure stops the initialization, rather than leaving every later table, column
+        and index missing.
+
+        Raises:
+            ScraperError: If the statement fails
+        """
+        conn = self._get_active_connection()
+        try:
+            conn.execute(sql)
         except sqlite3.Error as e:
-            logger.error(f"Database initialization error: {e}")
+            conn.rollback()
+            raise ScraperError(f"Database initialization failed on [{sql.strip()}] : {e}")
+
+    def _remove_duplicates(self, table: Table, columns: list[str]) -> None:
+        """
+        Delete the rows a unique index over the columns would reject, keeping the latest (highest id) row of each
+        key. Rows with a NULL in the key never conflict and are kept.
+        """
+        not_null = " AND ".join(f"{col} IS NOT NULL" for col in columns)
+        sql = f"""
+            DELETE FROM {table.name}
+            WHERE {not_null} AND id NOT IN (
+                SELECT MAX(id) FROM {table.name} WHERE {not_null} GROUP BY {", ".join(columns)}
+            )
+        """
+        try:
+            removed = self._get_active_connection().execute(sql).rowcount
+        except sqlite3.Error as e:
+            raise ScraperError(f"Failed to remove duplicate {columns} rows from [{table.name}] : {e}")
+        if removed:
+            logger.warning(f"Removed {removed} duplicate {columns} row(s) from [{table.name}], kept the latest of each")
+
+    @contextmanager
+    def unit_of_work(self) -> Iterator[UnitOfWork]:
+        """
+        Batch writes into a single transaction. Queued rows are committed when the block exits normally and
+        discarded if it raises.
+
+        Example:
+            with database.unit_of_work() as uow:
+                uow.upsert(PLAY_DATA_TABLE, play_data)
+        """
+        uow = UnitOfWork(self)
+        try:
+            yield uow
+        except BaseException:
+            uow.rollback()
+            raise
+        uow.commit()
 
     def insert_new_play_data(self, data: PlayData) -> bool:
         conn = self._get_active_connection()
         try:
             cursor = conn.cursor()
 
-            data_dict = asdict(data)
-
-            columns = ', '.join(data_dict.keys())
-            placeholders = ', '.join(['?' for _ in data_dict.values()])
-            sql = f"INSERT INTO play_data ({columns}) VALUES ({placeholders})"
+            sql, params = self.statements.compile_insert(PLAY_DATA_TABLE, data)
             logger.debug(f"Inserting new [play_data] using the following SQL query : \n{sql}")
-            cursor.execute(sql, tuple(data_dict.values()))
+            cursor.execute(sql, params)
             conn.commit()
-            logger.info(f"Successfully inserted [play_data] with idx: {data_dict.get('idx')}")
+            logger.info(f"Successfully inserted [play_data] with idx: {data.idx}")
             return True
         except sqlite3.IntegrityError as e:
             logger.error(f'Error when inserting data into [play_data] with idx: "{data.idx}" due to {e}')
@@ -168,20 +451,11 @@ class Database:
         try:
             cursor = conn.cursor()
 
-            # Convert dataclass -> dict
-            data_dict = asdict(entity)
-
-            # Keep only valid table columns
-            valid_columns = [col.name for col in table.columns if not col.primary_key or not col.autoincrement]
-            filtered_data = {k: v for k, v in data_dict.items() if k in valid_columns}
+            # Cached SQL for the table's insertable columns, parameters read straight from the entity
+            sql, params = self.statements.compile_insert(table, entity)
 
-            # Build SQL
-            columns = ', '.join(filtered_data.keys())
-            placeholders = ', '.join(['?' for _ in filtered_data])
-            sql = f"INSERT INTO {table.name} ({columns}) VALUES ({placeholders})"
-
-            logger.debug(f"Inserting into [{table.name}] using query:\n{sql}\nValues: {tuple(filtered_data.values())}")
-            cursor.execute(sql, tuple(filtered_data.values()))
+            logger.debug(f"Inserting into [{table.name}] using query:\n{sql}\nValues: {params}")
+            cursor.execute(sql, params)
             conn.commit()
 
             logger.info(f"Successfully inserted into [{table.name}]")
@@ -195,64 +469,32 @@ class Database:
 
     def upsert(self, table: Table, entity: Any) -> Any:
         """
-        Generic upsert method for any dataclass-based entity.
-        Assumes every table has an auto-increment 'id' primary key.
-        Automatically merges partial updates with existing data.
+        Generic upsert method for any dataclass-based entity, executed as a single INSERT ... ON CONFLICT statement.
+        Existing rows are matched on the table's natural key (Table.conflict_key) when the entity sets it, else on
+        the 'id' primary key. Partial updates are merged: fields that are None keep the existing value.
+        NOT NULL columns must still be set, SQLite checks them before detecting the conflict.
 
         Args:
             table (Table): Table definition
             entity (dataclass): Entity to insert or update (partial fields allowed)
 
         Returns:
-            dataclass: The inserted/updated entity with auto-generated PK updated
+            dataclass: The inserted/updated entity as stored, including the auto-generated PK
         """
         if not is_dataclass(entity):
             raise TypeError("Entity must be a dataclass instance")
 
-        entity_dict = asdict(entity)
         conn = self._get_active_connection()
+        sql, params = self.statements.compile_upsert(table, entity)
+        logger.debug(f"Upserting into [{table.name}] using the following SQL query : \n{sql}")
         cursor = conn.cursor()
-
-        # Check if the entity exists based on the id
-        entity_id = entity_dict.get("id")
-        if entity_id is not None:
-            sql_check = f"SELECT * FROM {table.name} WHERE id=? LIMIT 1"
-            cursor.execute(sql_check, (entity_id,))
-            row = cursor.fetchone()
-            if row:
-                # Convert row to dict for merging
-                existing_dict = dict(row)
-                # Merge: keep existing values for fields that are None in entity
-                merged_dict = {k: entity_dict[k] if entity_dict[k] is not None else existing_dict[k]
-                               for k in existing_dict.keys()}
-
-                # Update the database with merged_dict
-                update_fields = {k: v for k, v in merged_dict.items() if k != "id"}
-                if update_fields:
-                    set_clause = ', '.join(f"{col}=?" for col in update_fields)
-                    sql_update = f"UPDATE {table.name} SET {set_clause} WHERE id=?"
-                    values = list(update_fields.values()) + [entity_id]
-                    cursor.execute(sql_update, tuple(values))
-                    conn.commit()
-
-                # Return merged entity as dataclass
-                return type(entity)(**merged_dict)
-
-        # If entity_id is None or row doesn't exist, try to find by natural key (optional)
-        # Here we assume id is the only key; for other key strategies, modify accordingly
-
-        # Insert new row
-        insert_columns = [k for k in entity_dict.keys() if k != "id"]
-        insert_values = [v for k, v in entity_dict.items() if k != "id"]
-        columns_str = ', '.join(insert_columns)
-        placeholders = ', '.join(['?'] * len(insert_columns))
-        sql_insert = f"INSERT INTO {table.name} ({columns_str}) VALUES ({placeholders})"
-        cursor.execute(sql_insert, tuple(insert_values))
+        cursor.row_factory = None
+        cursor.execute(f"{sql} RETURNING *", params)
+        row = cursor.fetchone()
         conn.commit()
 
-        # Update entity's id with lastrowid
-        entity.id = cursor.lastrowid
-        return entity
+        # Nothing is returned when the conflicting row was left untouched
+        return self._map_rows(cursor, [row], type(entity))[0] if row else entity
 
     def update(self, table: Table, entity: Any) -> bool:
         pass
@@ -327,67 +569,22 @@ class Database:
             Dataclass instance or dict if limit=1,
             otherwise a list of dataclass instances or dicts.
         """
-        # Convert dataclass filters to dict
-        if filters is None:
-            filters = {}
-        elif is_dataclass(filters):
-            filters = asdict(filters)
-        elif not isinstance(filters, dict):
-            raise TypeError("filters must be a dataclass, dict, or None")
-
-        # Remove None values
-        filters = {k: v for k, v in filters.items() if v is not None}
+        filtered_columns = self._filter_columns(table, filters)
 
         conn = self._get_active_connection()
         try:
             cursor = conn.cursor()
+            cursor.row_factory = None  # Plain tuples, mapped by _map_rows
 
-            # Keep only valid table columns
-            valid_columns = {col.name for col in table.columns}
-            filtered_columns = {k: v for k, v in filters.items() if k in valid_columns}
-
-            # Build SQL and parameters
-            if filtered_columns:
-                where_clause = ' AND '.join(f"{col}=?" for col in filtered_columns)
-                sql = f"SELECT * FROM {table.name} WHERE {where_clause}"
-                params = tuple(filtered_columns.values())
-            else:
-                sql = f"SELECT * FROM {table.name}"
-                params = ()
-
-            if isinstance(limit, int) and limit > 0:
-                sql += f" LIMIT {limit}"
+            # Cached SQL per filter shape, the filter values and limit are bound as parameters
+            limited = isinstance(limit, int) and limit > 0
+            sql = self.statements.select_sql(table, tuple(filtered_columns), limited)
+            params = tuple(filtered_columns.values()) + ((limit,) if limited else ())
 
             cursor.execute(sql, params)
             rows = cursor.fetchall()
 
-            results = []
-            for row in rows:
-                row_dict = dict(row)
-
-                # Convert int -> bool for boolean fields in dataclass
-                data_class: Optional[Type[T]] = entity_class
-                if data_class is not None and is_dataclass(data_class):
-                    for field in fields(data_class):
-                        # runtime-safe check for bool and Optional[bool]
-                        field_type = field.type
-                        is_bool_field = False
-                        origin = getattr(field_type, "__origin__", None)
-                        args = getattr(field_type, "__args__", ())
-
-                        if field_type is bool:
-                            is_bool_field = True
-                        elif origin is Union and bool in args and type(None) in args:
-                            is_bool_field = True
-
-                        if is_bool_field and field.name in row_dict and row_dict[field.name] is not None:
-                            row_dict[field.name] = bool(row_dict[field.name])
-
-                # Map to dataclass or keep as dict
-                if data_class is not None and is_dataclass(data_class):
-                    results.append(data_class(**row_dict))
-                else:
-                    results.append(row_dict)
+            results = self._map_rows(cursor, rows, entity_class)
 
             # Return based on limit
             if limit == 1:
@@ -399,6 +596,139 @@ class Database:
             logger.error(f"Error fetching row(s) from [{table.name}]: {e}")
             return [] if limit != 1 else None
 
+    def iter_select(
+            self,
+            table: Table,
+            filters: Optional[Any] = None,
+            entity_class: Optional[Type[T]] = None,
+            chunk_size: int = 1000,
+            after_id: Optional[int] = None,
+    ) -> Iterator[Union[T, dict]]:
+        """
+        Stream the rows of a SELECT query on the given table, fetching them chunk_size at a time, so that memory stays
+        constant however many rows match. Runs on a pooled read-only connection, which is held until the generator
+        is exhausted or closed.
+
+        Args:
+            table (Table): Table definition.
+            filters (dict or dataclass, optional): Filter conditions, see select(). If None, selects all rows.
+            entity_class (Type[T], optional): Dataclass type to map results into. If None, yields dicts.
+            chunk_size (int): Number of rows fetched from SQLite at a time.
+            after_id (int, optional): Only stream rows with a greater id, in id order. Lets a consumer resume
+                from the last row it processed.
+
+        Yields:
+            Dataclass instances or dicts, one per matching row.
+
+        Raises:
+            ScraperError: If the query fails, so that a partial result is never mistaken for a complete one.
+        """
+        if chunk_size < 1:
+            raise ValueError(f"Chunk size must be positive, got {chunk_size}")
+
+        filtered_columns = self._filter_columns(table, filters)
+        sql = self.statements.select_sql(table, tuple(filtered_columns), False, after_id is not None)
+        params = tuple(filtered_columns.values()) + ((after_id,) if after_id is not None else ())
+
+        with self.reader() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            try:
+                cursor.execute(sql, params)
+                mapper = self._row_mapper_for(cursor, entity_class)
+                while rows := cursor.fetchmany(chunk_size):
+                    yield from map(mapper, rows)
+            except sqlite3.Error as e:
+                raise ScraperError(f"Error streaming rows from [{table.name}]: {e}")
+            finally:
+                cursor.close()
+
+    def _filter_columns(self, table: Table, filters: Optional[Any]) -> dict[str, Any]:
+        """
+        Normalize select filters (dict, dataclass or None) to {column: value}, dropping None values and keys that are
+        not columns of the table.
+        """
+        # Convert dataclass filters to dict
+        if filters is None:
+            filters = {}
+        elif hasattr(filters, "to_row"):
+            filters = dict(zip(filters.COLUMNS, filters.to_row()))
+        elif is_dataclass(filters):
+            filters = asdict(filters)
+        elif not isinstance(filters, dict):
+            raise TypeError("filters must be a dataclass, dict, or None")
+
+        # Keep only valid, non-None table columns
+        valid_columns = self.statements.column_names(table)
+        return {k: v for k, v in filters.items() if v is not None and k in valid_columns}
+
+    @staticmethod
+    def _row_mapper_for(cursor: sqlite3.Cursor, entity_class: Optional[Type[T]]) -> Callable[[Sequence], Any]:
+        """
+        Function mapping a plain row tuple of the cursor's last query to the dataclass, converting int -> bool for
+        boolean fields. Maps to dicts when no dataclass is given.
+        """
+        columns = tuple(description[0] for description in cursor.description)
+        if entity_class is not None and is_dataclass(entity_class):
+            return _row_mapper(entity_class, columns)
+        return lambda row: dict(zip(columns, row))
+
+    @staticmethod
+    def _map_rows(cursor: sqlite3.Cursor, rows: list[Sequence], entity_class: Optional[Type[T]]) -> list:
+        """
+        Map plain row tuples of the cursor's last query, see _row_mapper_for.
+        """
+        mapper = Database._row_mapper_for(cursor, entity_class)
+        return [mapper(row) for row in rows]
+
+    def backfill(
+            self,
+            table: Table,
+            source_columns: list[str],
+            target_columns: list[str],
+            compute: Callable[..., tuple],
+            batch_size: int = 1000,
+    ) -> int:
+        """
+        Fill columns of existing rows from other columns of the same row, in id order, one transaction per batch so
+        the database is never locked for long. Used by migrations after adding derived columns.
+
+        Only rows where the first target column is NULL and the first source column is not are visited, so an
+        interrupted backfill simply resumes when run again.
+
+        Args:
+            table (Table): Table to backfill.
+            source_columns (list[str]): Columns passed to compute, in order.
+            target_columns (list[str]): Columns written, in the order compute returns them.
+            compute (Callable): Maps the source values of a row to the target values.
+            batch_size (int): Rows read and updated per transaction.
+
+        Returns:
+            int: Number of rows updated
+        """
+        select_sql = (
+            f"SELECT id, {', '.join(source_columns)} FROM {table.name} "
+            f"WHERE id > ? AND {target_columns[0]} IS NULL AND {source_columns[0]} IS NOT NULL "
+            f"ORDER BY id LIMIT ?"
+        )
+        update_sql = f"UPDATE {table.name} SET {', '.join(f'{col}=?' for col in target_columns)} WHERE id=?"
+
+        conn = self._get_active_connection()
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        last_id, updated = 0, 0
+        try:
+            while rows := cursor.execute(select_sql, (last_id, batch_size)).fetchall():
+                with conn:
+                    conn.executemany(update_sql, [(*compute(*row[1:]), row[0]) for row in rows])
+                last_id = rows[-1][0]
+                updated += len(rows)
+                logger.debug(f"Backfilled {updated} row(s) of [{table.name}] up to id {last_id}")
+        except sqlite3.Error as e:
+            raise ScraperError(f"Backfill of {target_columns} in [{table.name}] stopped at id {last_id} due to {e}")
+        logger.info(f"Backfilled {target_columns} of {updated} row(s) in [{table.name}]")
+        return updated
+
     def check_if_play_data_exists(self, idx: str) -> bool:
         """
         Checks if a play data record with the given 'idx' already exists in the 'play_data' table,
@@ -416,13 +746,110 @@ class Database:
             cursor.execute("SELECT 1 FROM play_data WHERE idx = ?", (idx,))
             result = cursor.fetchone()
             if result is not None:
-                logger.info(f"Play log {idx} exists, skipping")
+                logger.debug(f"Play log {idx} exists, skipping")
                 return True
             return False
         except sqlite3.Error as e:
             logger.error(f"Error checking play data existence: {e}")
             return False
 
+    def get_all_play_data_idx(self) -> set[str]:
+        """
+        Fetch the idx of every stored play data in a single query.
+
+        Returns:
+            set[str]: All stored idx values, empty if the query fails.
+        """
+        conn = self._get_active_connection()
+        try:
+            cursor = conn.execute("SELECT idx FROM play_data")
+            return {row[0] for row in cursor}
+        except sqlite3.Error as e:
+            logger.error(f"Error fetching play data idx: {e}")
+            return set()
+
+    def find_undetailed_plays(self, idx_values: Iterable[str]) -> list[PlayRecord]:
+        """
+        Load which of the given plays are stored without their details, in one query per 500 idx served by the
+        partial index on detailed = 0. Plays that are not stored at all are not returned.
+
+        Args:
+            idx_values (Iterable[str]): idx of the plays to check, e.g. every play on the records page.
+
+        Returns:
+            list[PlayRecord]: The plays among them stored with detailed = 0, in no particular order. Empty if the
+            query fails.
+        """
+        idx_values = list(idx_values)
+        conn = self._get_active_connection()
+        undetailed = []
+        try:
+            for start in range(0, len(idx_values), 500):
+                chunk = idx_values[start:start + 500]
+                cursor = conn.cursor()
+                cursor.row_factory = None
+                cursor.execute(
+                    f"SELECT * FROM {PLAY_RECORD_VIEW.name} "
+                    f"WHERE detailed = 0 AND idx IN ({', '.join(['?'] * len(chunk))})",
+                    chunk,
+                )
+                undetailed.extend(self._map_rows(cursor, cursor.fetchall(), PlayRecord))
+            return undetailed
+        except sqlite3.Error as e:
+            logger.error(f"Error finding play data without details, orphaned plays are not detailed this check: {e}")
+            return []
+
+    def get_play_data_between(self, start_epoch: int, end_epoch: Optional[int] = None) -> list[PlayRecord]:
+        """
+        Fetch the plays played in a time window, oldest first, with a range scan of the played_at_epoch index.
+
+        Args:
+            start_epoch (int): Start of the window in Unix seconds, inclusive.
+            end_epoch (int, optional): End of the window in Unix seconds, exclusive. Open-ended if None.
+
+        Returns:
+            list[PlayRecord]: Plays in the window, empty if the query fails.
+        """
+        conn = self._get_active_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            cursor.execute(
+                f"SELECT * FROM {PLAY_RECORD_VIEW.name} WHERE played_at_epoch >= ? AND played_at_epoch < ? "
+                "ORDER BY played_at_epoch",
+                (start_epoch, end_epoch if end_epoch is not None else 2 ** 63 - 1),
+            )
+            return self._map_rows(cursor, cursor.fetchall(), PlayRecord)
+        except sqlite3.Error as e:
+            logger.error(f"Error fetching play data between {start_epoch} and {end_epoch}: {e}")
+            return []
+
+    def get_play_data_by_achievement(self, min_value: int, max_value: Optional[int] = None) -> list[PlayRecord]:
+        """
+        Fetch the plays with an achievement in a range, best first, with a range scan of the achievement_value index.
+
+        Args:
+            min_value (int): Lowest achievement in ten-thousandths of a percent (see
+                scraping_utils.parse_achievement_value), inclusive.
+            max_value (int, optional): Highest achievement, inclusive. Open-ended if None.
+
+        Returns:
+            list[PlayRecord]: Plays in the range, empty if the query fails.
+        """
+        conn = self._get_active_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            cursor.execute(
+                f"SELECT * FROM {PLAY_RECORD_VIEW.name} WHERE achievement_value >= ? AND achievement_value <= ? "
+                "ORDER BY achievement_value DESC",
+                (min_value, max_value if max_value is not None else 2 ** 63 - 1),
+            )
+            return self._map_rows(cursor, cursor.fetchall(), PlayRecord)
+        except sqlite3.Error as e:
+            logger.error(f"Error fetching play data with achievement between {min_value} and {max_value}: {e}")
+            return []
+
     def get_song_data(self, song_title: str, song_type: str) -> Optional[SongData]:
         """
         Fetch a play data record with the given song_title and song_type.
@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 
 @dataclass
@@ -11,6 +11,7 @@ class Column:
     unique: bool = False
     autoincrement: bool = False
     nullable: bool = True  # True = NULL, False = NOT NULL
+    references: Optional[str] = None  # Foreign key target, e.g. "chart(id)"
 
     def to_sql_definition(self) -> str:
         """Generates the SQL definition for the column."""
@@ -23,30 +24,92 @@ class Column:
             parts.append("UNIQUE")
         if not self.nullable and not self.primary_key:
             parts.append("NOT NULL")
+        if self.references:
+            parts.append(f"REFERENCES {self.references}")
         return " ".join(parts)
 
 
 @dataclass
 class Table:
-    """Represents a database table with its columns and indexes."""
+    """Represents a database table with its columns, indexes and unique constraints."""
     name: str
     columns: list[Column]
     # Indexes are defined as a list of dictionaries for flexibility
-    # Each dict can contain 'name' (str), 'columns' (List[str]), 'unique' (bool)
+    # Each dict can contain 'name' (str), 'columns' (List[str]), 'unique' (bool), 'where' (str, partial index)
     indexes: list[Dict[str, Any]] = field(default_factory=list)
+    # Composite UNIQUE constraints, each a list of column names. The first one is the natural key used by upsert
+    unique_constraints: list[list[str]] = field(default_factory=list)
 
     def generate_create_table_sql(self) -> str:
         """Generates the CREATE TABLE SQL statement for this table."""
-        column_definitions = [col.to_sql_definition() for col in self.columns]
+        definitions = [col.to_sql_definition() for col in self.columns]
+        definitions += [f"UNIQUE ({', '.join(columns)})" for columns in self.unique_constraints]
         return f"CREATE TABLE IF NOT EXISTS {self.name} (\n    " + \
-            ",\n    ".join(column_definitions) + "\n);"
+            ",\n    ".join(definitions) + "\n);"
+
+    def generate_create_unique_constraint_sql(self, columns: list[str]) -> str:
+        """
+        Generates a UNIQUE INDEX enforcing a unique constraint, for tables created before the constraint was declared.
+        SQLite cannot add constraints to an existing table, but treats a unique index the same way.
+        """
+        return f"CREATE UNIQUE INDEX IF NOT EXISTS uq_{self.name}_{'_'.join(columns)} " \
+               f"ON {self.name}({', '.join(columns)});"
+
+    @property
+    def conflict_key(self) -> list[str]:
+        """Natural key upsert resolves conflicts on: the first unique constraint, else the first UNIQUE column."""
+        if self.unique_constraints:
+            return self.unique_constraints[0]
+        return next(([col.name] for col in self.columns if col.unique and not col.primary_key), [])
+
+    def generate_upsert_sql(self, columns: list[str], conflict_columns: list[str]) -> str:
+        """
+        Generates a single INSERT ... ON CONFLICT DO UPDATE statement. On conflict, every column is overwritten
+        except where the new value is NULL, which keeps the existing value.
+
+        Args:
+            columns: Columns being written, in parameter order.
+            conflict_columns: Columns of the PRIMARY KEY or UNIQUE constraint identifying an existing row.
+                If empty, a plain INSERT is generated.
+        """
+        placeholders = ', '.join(['?'] * len(columns))
+        sql = f"INSERT INTO {self.name} ({', '.join(columns)}) VALUES ({placeholders})"
+        if not conflict_columns:
+            return sql
+
+        update_columns = [col for col in columns if col not in conflict_columns and col != "id"]
+        if not update_columns:
+            return sql + f" ON CONFLICT({', '.join(conflict_columns)}) DO NOTHING"
+        set_clause = ', '.join(f"{col}=COALESCE(excluded.{col}, {col})" for col in update_columns)
+        return sql + f" ON CONFLICT({', '.join(conflict_columns)}) DO UPDATE SET {set_clause}"
+
+    def generate_add_column_sql(self, column: Column) -> str:
+        """
+        Generates ALTER TABLE ADD COLUMN, for tables created before the column was declared.
+        SQLite can only add columns that are nullable (or have a default), so new columns must be nullable.
+        """
+        return f"ALTER TABLE {self.name} ADD COLUMN {column.to_sql_definition()};"
 
     def generate_create_index_sql(self, index_def: dict) -> str:
         """Generates CREATE INDEX SQL statements for given index object on this table."""
         index_name = index_def["name"]
         index_columns = ", ".join(index_def["columns"])
         unique_keyword = "UNIQUE " if index_def.get("unique", False) else ""
-        return f"CREATE {unique_keyword}INDEX IF NOT EXISTS {index_name} ON {self.name}({index_columns});"
+        # Partial index, only used by queries whose WHERE clause contains the same condition
+        where_clause = f" WHERE {index_def['where']}" if index_def.get("where") else ""
+        return f"CREATE {unique_keyword}INDEX IF NOT EXISTS {index_name} ON {self.name}({index_columns}){where_clause};"
+
+
+@dataclass
+class View(Table):
+    """
+    A read-only query exposed under a name, selected from like a table (Database.select, iter_select, the exporter).
+    Its columns are the query's result columns, in order, and generate its model. Never written to.
+    """
+    select_sql: str = ""
+
+    def generate_create_view_sql(self) -> str:
+        return f"CREATE VIEW IF NOT EXISTS {self.name} AS {self.select_sql};"
 
 
 # === Tables ===
@@ -57,10 +120,9 @@ PLAY_DATA_TABLE = Table(
         # Creating an ID anyway cause IDX sorting is unusable due to its format
         Column("id", "INTEGER", primary_key=True, autoincrement=True),
         Column("idx", "TEXT", unique=True, nullable=False),
-        Column("title", "TEXT", nullable=False),
-        Column("difficulty", "TEXT", nullable=False),
+        # Title, music_type and difficulty, read through PLAY_RECORD_VIEW
+        Column("chart_id", "INTEGER", references="chart(id)"),
         Column("track", "TEXT"),
-        Column("music_type", "TEXT"),
         Column("new_achievement", "BOOLEAN"),
         Column("achievement", "TEXT"),
         Column("rank", "TEXT"),
@@ -103,10 +165,22 @@ PLAY_DATA_TABLE = Table(
         Column("sync", "INTEGER"),
         Column("max_sync", "INTEGER"),
         Column("detailed", "BOOLEAN"),
-        Column("play_data_version", "INTEGER")  # Internal scraper use to handle website changes
+        Column("play_data_version", "INTEGER"),  # Internal scraper use to handle website changes
+        # Parsed from the display strings above, for range queries and sorting
+        Column("achievement_value", "INTEGER"),  # Ten-thousandths of a percent, 100.5000% = 1005000
+        Column("dx_score_value", "INTEGER"),
+        Column("dx_score_max", "INTEGER"),
+        Column("played_at_epoch", "INTEGER"),  # Unix seconds, played_at read in the region's timezone
     ],
     indexes=[
-        {"name": "idx_play_data_idx", "columns": ["idx"], "unique": True}  # Explicit unique index
+        {"name": "idx_play_data_idx", "columns": ["idx"], "unique": True},  # Explicit unique index
+        {"name": "idx_play_data_achievement_value", "columns": ["achievement_value"]},
+        {"name": "idx_play_data_dx_score_value", "columns": ["dx_score_value"]},
+        {"name": "idx_play_data_played_at_epoch", "columns": ["played_at_epoch"]},
+        # Best/latest play lookups per chart
+        {"name": "idx_play_data_chart_id", "columns": ["chart_id", "played_at_epoch"]},
+        # Plays still waiting for their details, a handful of rows whatever the history size
+        {"name": "idx_play_data_undetailed", "columns": ["idx"], "where": "detailed = 0"},
     ]
 )
 
@@ -134,6 +208,15 @@ SONG_DATA_TABLE = Table(
         Column("dx_score_master", "TEXT"),
         Column("score_remaster", "TEXT"),
         Column("dx_score_remaster", "TEXT"),
+        Column("song_id", "INTEGER", references="song(id)"),
+        Column("score_utage", "TEXT"),
+        Column("dx_score_utage", "TEXT"),
+    ],
+    unique_constraints=[
+        ["song_title", "song_type"]
+    ],
+    indexes=[
+        {"name": "idx_song_data_song_id", "columns": ["song_id"]},
     ]
 )
 
@@ -147,4 +230,65 @@ METADATA_TABLE = Table(
     ]
 )
 
-TABLE_LIST: list[Table] = [PLAY_DATA_TABLE, PLAYER_DATA_TABLE, SONG_DATA_TABLE, METADATA_TABLE]
+# High-water marks of incremental exports, see scraper/export/exporter.py
+EXPORT_STATE_TABLE = Table(
+    name="export_state",
+    columns=[
+        Column("id", "INTEGER", primary_key=True, autoincrement=True),
+        Column("export_name", "TEXT", unique=True, nullable=False),
+        Column("table_name", "TEXT", nullable=False),
+        Column("last_exported_id", "INTEGER", nullable=False),  # Highest id of the exported table written so far
+        Column("exported_at", "TEXT"),
+    ]
+)
+
+# Songs and charts, each stored once and referenced by id. See scraper/resources/chart_registry.py
+SONG_TABLE = Table(
+    name="song",
+    columns=[
+        Column("id", "INTEGER", primary_key=True, autoincrement=True),
+        Column("title", "TEXT", nullable=False),
+        Column("music_type", "TEXT", nullable=False),  # dx or standard, a song has separate charts for each
+    ],
+    unique_constraints=[
+        ["title", "music_type"]
+    ]
+)
+
+CHART_TABLE = Table(
+    name="chart",
+    columns=[
+        Column("id", "INTEGER", primary_key=True, autoincrement=True),
+        Column("song_id", "INTEGER", nullable=False, references="song(id)"),
+        Column("difficulty", "TEXT", nullable=False),
+    ],
+    unique_constraints=[
+        ["song_id", "difficulty"]
+    ]
+)
+
+# === Views ===
+
+# Plays with the title, difficulty and music_type of their chart, as shown on the records page
+PLAY_RECORD_VIEW = View(
+    name="play_record",
+    columns=[
+        *PLAY_DATA_TABLE.columns,
+        Column("title", "TEXT"),
+        Column("difficulty", "TEXT"),
+        Column("music_type", "TEXT"),
+    ],
+    select_sql=(
+        f"SELECT {', '.join(f'{PLAY_DATA_TABLE.name}.{col.name}' for col in PLAY_DATA_TABLE.columns)}, "
+        f"song.title, chart.difficulty, song.music_type "
+        f"FROM {PLAY_DATA_TABLE.name} "
+        f"LEFT JOIN chart ON chart.id = {PLAY_DATA_TABLE.name}.chart_id "
+        f"LEFT JOIN song ON song.id = chart.song_id"
+    ),
+)
+
+# Referenced tables first, so the foreign keys of the later ones resolve while the schema is initialized
+TABLE_LIST: list[Table] = [SONG_TABLE, CHART_TABLE, PLAY_DATA_TABLE, PLAYER_DATA_TABLE, SONG_DATA_TABLE, METADATA_TABLE,
+                           EXPORT_STATE_TABLE]
+
+VIEW_LIST: list[View] = [PLAY_RECORD_VIEW]
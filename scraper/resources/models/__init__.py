@@ -1,4 +1,8 @@
+from .song import Song
+from .chart import Chart
 from .play_data import PlayData
 from .player_data import PlayerData
 from .song_data import SongData
 from .metadata import Metadata
+from .export_state import ExportState
+from .play_record import PlayRecord
@@ -0,0 +1,30 @@
+from dataclasses import dataclass
+from typing import ClassVar, Optional, Sequence
+
+
+@dataclass(slots=True)
+class Chart:
+    id: Optional[int] = None
+    song_id: int = None
+    difficulty: str = None
+
+    COLUMNS: ClassVar[tuple[str, ...]] = (
+        "id",
+        "song_id",
+        "difficulty",
+    )
+
+    def to_row(self) -> tuple:
+        return (
+            self.id,
+            self.song_id,
+            self.difficulty,
+        )
+
+    @classmethod
+    def from_row(cls, row: Sequence) -> "Chart":
+        return cls(
+            row[0],
+            row[1],
+            row[2],
+        )
@@ -0,0 +1,38 @@
+from dataclasses import dataclass
+from typing import ClassVar, Optional, Sequence
+
+
+@dataclass(slots=True)
+class ExportState:
+    id: Optional[int] = None
+    export_name: str = None
+    table_name: str = None
+    last_exported_id: int = None
+    exported_at: Optional[str] = None
+
+    COLUMNS: ClassVar[tuple[str, ...]] = (
+        "id",
+        "export_name",
+        "table_name",
+        "last_exported_id",
+        "exported_at",
+    )
+
+    def to_row(self) -> tuple:
+        return (
+            self.id,
+            self.export_name,
+            self.table_name,
+            self.last_exported_id,
+            self.exported_at,
+        )
+
+    @classmethod
+    def from_row(cls, row: Sequence) -> "ExportState":
+        return cls(
+            row[0],
+            row[1],
+            row[2],
+            row[3],
+            row[4],
+        )
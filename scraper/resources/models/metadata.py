@@ -1,10 +1,34 @@
 from dataclasses import dataclass
-from typing import Optional
+from typing import ClassVar, Optional, Sequence
 
 
-@dataclass
+@dataclass(slots=True)
 class Metadata:
     id: Optional[int] = None
     scraper_version: str = None
     database_version: int = None
     play_data_version: int = None
+
+    COLUMNS: ClassVar[tuple[str, ...]] = (
+        "id",
+        "scraper_version",
+        "database_version",
+        "play_data_version",
+    )
+
+    def to_row(self) -> tuple:
+        return (
+            self.id,
+            self.scraper_version,
+            self.database_version,
+            self.play_data_version,
+        )
+
+    @classmethod
+    def from_row(cls, row: Sequence) -> "Metadata":
+        return cls(
+            row[0],
+            row[1],
+            row[2],
+            row[3],
+        )
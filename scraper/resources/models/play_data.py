@@ -1,15 +1,13 @@
 from dataclasses import dataclass
-from typing import Optional
+from typing import ClassVar, Optional, Sequence
 
 
-@dataclass
+@dataclass(slots=True)
 class PlayData:
     id: Optional[int] = None
     idx: str = None
-    title: str = None
-    difficulty: str = None
+    chart_id: Optional[int] = None
     track: Optional[str] = None
-    music_type: Optional[str] = None
     new_achievement: Optional[bool] = None
     achievement: Optional[str] = None
     rank: Optional[str] = None
@@ -53,3 +51,172 @@ class PlayData:
     max_sync: Optional[int] = None
     detailed: Optional[bool] = None
     play_data_version: Optional[int] = None
+    achievement_value: Optional[int] = None
+    dx_score_value: Optional[int] = None
+    dx_score_max: Optional[int] = None
+    played_at_epoch: Optional[int] = None
+
+    COLUMNS: ClassVar[tuple[str, ...]] = (
+        "id",
+        "idx",
+        "chart_id",
+        "track",
+        "new_achievement",
+        "achievement",
+        "rank",
+        "new_dx_score",
+        "dx_score",
+        "dx_stars",
+        "combo_status",
+        "sync_status",
+        "place",
+        "played_at",
+        "fast",
+        "late",
+        "tap_critical",
+        "tap_perfect",
+        "tap_great",
+        "tap_good",
+        "tap_miss",
+        "hold_critical",
+        "hold_perfect",
+        "hold_great",
+        "hold_good",
+        "hold_miss",
+        "slide_critical",
+        "slide_perfect",
+        "slide_great",
+        "slide_good",
+        "slide_miss",
+        "touch_critical",
+        "touch_perfect",
+        "touch_great",
+        "touch_good",
+        "touch_miss",
+        "break_critical",
+        "break_perfect",
+        "break_great",
+        "break_good",
+        "break_miss",
+        "combo",
+        "max_combo",
+        "sync",
+        "max_sync",
+        "detailed",
+        "play_data_version",
+        "achievement_value",
+        "dx_score_value",
+        "dx_score_max",
+        "played_at_epoch",
+    )
+
+    def to_row(self) -> tuple:
+        return (
+            self.id,
+            self.idx,
+            self.chart_id,
+            self.track,
+            self.new_achievement,
+            self.achievement,
+            self.rank,
+            self.new_dx_score,
+            self.dx_score,
+            self.dx_stars,
+            self.combo_status,
+            self.sync_status,
+            self.place,
+            self.played_at,
+            self.fast,
+            self.late,
+            self.tap_critical,
+            self.tap_perfect,
+            self.tap_great,
+            self.tap_good,
+            self.tap_miss,
+            self.hold_critical,
+            self.hold_perfect,
+            self.hold_great,
+            self.hold_good,
+            self.hold_miss,
+            self.slide_critical,
+            self.slide_perfect,
+            self.slide_great,
+            self.slide_good,
+            self.slide_miss,
+            self.touch_critical,
+            self.touch_perfect,
+            self.touch_great,
+            self.touch_good,
+            self.touch_miss,
+            self.break_critical,
+            self.break_perfect,
+            self.break_great,
+            self.break_good,
+            self.break_miss,
+            self.combo,
+            self.max_combo,
+            self.sync,
+            self.max_sync,
+            self.detailed,
+            self.play_data_version,
+            self.achievement_value,
+            self.dx_score_value,
+            self.dx_score_max,
+            self.played_at_epoch,
+        )
+
+    @classmethod
+    def from_row(cls, row: Sequence) -> "PlayData":
+        return cls(
+            row[0],
+            row[1],
+            row[2],
+            row[3],
+            None if row[4] is None else bool(row[4]),
+            row[5],
+            row[6],
+            None if row[7] is None else bool(row[7]),
+            row[8],
+            row[9],
+            row[10],
+            row[11],
+            row[12],
+            row[13],
+            row[14],
+            row[15],
+            row[16],
+            row[17],
+            row[18],
+            row[19],
+            row[20],
+            row[21],
+            row[22],
+            row[23],
+            row[24],
+            row[25],
+            row[26],
+            row[27],
+            row[28],
+            row[29],
+            row[30],
+            row[31],
+            row[32],
+            row[33],
+            row[34],
+            row[35],
+            row[36],
+            row[37],
+            row[38],
+            row[39],
+            row[40],
+            row[41],
+            row[42],
+            row[43],
+            row[44],
+            None if row[45] is None else bool(row[45]),
+            row[46],
+            row[47],
+            row[48],
+            row[49],
+            row[50],
+        )
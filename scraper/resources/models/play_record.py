@@ -0,0 +1,234 @@
+from dataclasses import dataclass
+from typing import ClassVar, Optional, Sequence
+
+
+@dataclass(slots=True)
+class PlayRecord:
+    id: Optional[int] = None
+    idx: str = None
+    chart_id: Optional[int] = None
+    track: Optional[str] = None
+    new_achievement: Optional[bool] = None
+    achievement: Optional[str] = None
+    rank: Optional[str] = None
+    new_dx_score: Optional[bool] = None
+    dx_score: Optional[str] = None
+    dx_stars: Optional[int] = None
+    combo_status: Optional[str] = None
+    sync_status: Optional[str] = None
+    place: Optional[str] = None
+    played_at: Optional[str] = None
+    fast: Optional[int] = None
+    late: Optional[int] = None
+    tap_critical: Optional[int] = None
+    tap_perfect: Optional[int] = None
+    tap_great: Optional[int] = None
+    tap_good: Optional[int] = None
+    tap_miss: Optional[int] = None
+    hold_critical: Optional[int] = None
+    hold_perfect: Optional[int] = None
+    hold_great: Optional[int] = None
+    hold_good: Optional[int] = None
+    hold_miss: Optional[int] = None
+    slide_critical: Optional[int] = None
+    slide_perfect: Optional[int] = None
+    slide_great: Optional[int] = None
+    slide_good: Optional[int] = None
+    slide_miss: Optional[int] = None
+    touch_critical: Optional[int] = None
+    touch_perfect: Optional[int] = None
+    touch_great: Optional[int] = None
+    touch_good: Optional[int] = None
+    touch_miss: Optional[int] = None
+    break_critical: Optional[int] = None
+    break_perfect: Optional[int] = None
+    break_great: Optional[int] = None
+    break_good: Optional[int] = None
+    break_miss: Optional[int] = None
+    combo: Optional[int] = None
+    max_combo: Optional[int] = None
+    sync: Optional[int] = None
+    max_sync: Optional[int] = None
+    detailed: Optional[bool] = None
+    play_data_version: Optional[int] = None
+    achievement_value: Optional[int] = None
+    dx_score_value: Optional[int] = None
+    dx_score_max: Optional[int] = None
+    played_at_epoch: Optional[int] = None
+    title: Optional[str] = None
+    difficulty: Optional[str] = None
+    music_type: Optional[str] = None
+
+    COLUMNS: ClassVar[tuple[str, ...]] = (
+        "id",
+        "idx",
+        "chart_id",
+        "track",
+        "new_achievement",
+        "achievement",
+        "rank",
+        "new_dx_score",
+        "dx_score",
+        "dx_stars",
+        "combo_status",
+        "sync_status",
+        "place",
+        "played_at",
+        "fast",
+        "late",
+        "tap_critical",
+        "tap_perfect",
+        "tap_great",
+        "tap_good",
+        "tap_miss",
+        "hold_critical",
+        "hold_perfect",
+        "hold_great",
+        "hold_good",
+        "hold_miss",
+        "slide_critical",
+        "slide_perfect",
+        "slide_great",
+        "slide_good",
+        "slide_miss",
+        "touch_critical",
+        "touch_perfect",
+        "touch_great",
+        "touch_good",
+        "touch_miss",
+        "break_critical",
+        "break_perfect",
+        "break_great",
+        "break_good",
+        "break_miss",
+        "combo",
+        "max_combo",
+        "sync",
+        "max_sync",
+        "detailed",
+        "play_data_version",
+        "achievement_value",
+        "dx_score_value",
+        "dx_score_max",
+        "played_at_epoch",
+        "title",
+        "difficulty",
+        "music_type",
+    )
+
+    def to_row(self) -> tuple:
+        return (
+            self.id,
+            self.idx,
+            self.chart_id,
+            self.track,
+            self.new_achievement,
+            self.achievement,
+            self.rank,
+            self.new_dx_score,
+            self.dx_score,
+            self.dx_stars,
+            self.combo_status,
+            self.sync_status,
+            self.place,
+            self.played_at,
+            self.fast,
+            self.late,
+            self.tap_critical,
+            self.tap_perfect,
+            self.tap_great,
+            self.tap_good,
+            self.tap_miss,
+            self.hold_critical,
+            self.hold_perfect,
+            self.hold_great,
+            self.hold_good,
+            self.hold_miss,
+            self.slide_critical,
+            self.slide_perfect,
+            self.slide_great,
+            self.slide_good,
+            self.slide_miss,
+            self.touch_critical,
+            self.touch_perfect,
+            self.touch_great,
+            self.touch_good,
+            self.touch_miss,
+            self.break_critical,
+            self.break_perfect,
+            self.break_great,
+            self.break_good,
+            self.break_miss,
+            self.combo,
+            self.max_combo,
+            self.sync,
+            self.max_sync,
+            self.detailed,
+            self.play_data_version,
+            self.achievement_value,
+            self.dx_score_value,
+            self.dx_score_max,
+            self.played_at_epoch,
+            self.title,
+            self.difficulty,
+            self.music_type,
+        )
+
+    @classmethod
+    def from_row(cls, row: Sequence) -> "PlayRecord":
+        return cls(
+            row[0],
+            row[1],
+            row[2],
+            row[3],
+            None if row[4] is None else bool(row[4]),
+            row[5],
+            row[6],
+            None if row[7] is None else bool(row[7]),
+            row[8],
+            row[9],
+            row[10],
+            row[11],
+            row[12],
+            row[13],
+            row[14],
+            row[15],
+            row[16],
+            row[17],
+            row[18],
+            row[19],
+            row[20],
+            row[21],
+            row[22],
+            row[23],
+            row[24],
+            row[25],
+            row[26],
+            row[27],
+            row[28],
+            row[29],
+            row[30],
+            row[31],
+            row[32],
+            row[33],
+            row[34],
+            row[35],
+            row[36],
+            row[37],
+            row[38],
+            row[39],
+            row[40],
+            row[41],
+            row[42],
+            row[43],
+            row[44],
+            None if row[45] is None else bool(row[45]),
+            row[46],
+            row[47],
+            row[48],
+            row[49],
+            row[50],
+            row[51],
+            row[52],
+            row[53],
+        )
@@ -1,8 +1,26 @@
 from dataclasses import dataclass
-from typing import Optional
+from typing import ClassVar, Optional, Sequence
 
 
-@dataclass
+@dataclass(slots=True)
 class PlayerData:
     id: Optional[int] = None
     total_plays: int = None
+
+    COLUMNS: ClassVar[tuple[str, ...]] = (
+        "id",
+        "total_plays",
+    )
+
+    def to_row(self) -> tuple:
+        return (
+            self.id,
+            self.total_plays,
+        )
+
+    @classmethod
+    def from_row(cls, row: Sequence) -> "PlayerData":
+        return cls(
+            row[0],
+            row[1],
+        )
@@ -0,0 +1,30 @@
+from dataclasses import dataclass
+from typing import ClassVar, Optional, Sequence
+
+
+@dataclass(slots=True)
+class Song:
+    id: Optional[int] = None
+    title: str = None
+    music_type: str = None
+
+    COLUMNS: ClassVar[tuple[str, ...]] = (
+        "id",
+        "title",
+        "music_type",
+    )
+
+    def to_row(self) -> tuple:
+        return (
+            self.id,
+            self.title,
+            self.music_type,
+        )
+
+    @classmethod
+    def from_row(cls, row: Sequence) -> "Song":
+        return cls(
+            row[0],
+            row[1],
+            row[2],
+        )
@@ -1,8 +1,8 @@
 from dataclasses import dataclass
-from typing import Optional
+from typing import ClassVar, Optional, Sequence
 
 
-@dataclass
+@dataclass(slots=True)
 class SongData:
     id: Optional[int] = None
     song_title: str = None
@@ -17,3 +17,66 @@ class SongData:
     dx_score_master: Optional[str] = None
     score_remaster: Optional[str] = None
     dx_score_remaster: Optional[str] = None
+    song_id: Optional[int] = None
+    score_utage: Optional[str] = None
+    dx_score_utage: Optional[str] = None
+
+    COLUMNS: ClassVar[tuple[str, ...]] = (
+        "id",
+        "song_title",
+        "song_type",
+        "score_basic",
+        "dx_score_basic",
+        "score_advanced",
+        "dx_score_advanced",
+        "score_expert",
+        "dx_score_expert",
+        "score_master",
+        "dx_score_master",
+        "score_remaster",
+        "dx_score_remaster",
+        "song_id",
+        "score_utage",
+        "dx_score_utage",
+    )
+
+    def to_row(self) -> tuple:
+        return (
+            self.id,
+            self.song_title,
+            self.song_type,
+            self.score_basic,
+            self.dx_score_basic,
+            self.score_advanced,
+            self.dx_score_advanced,
+            self.score_expert,
+            self.dx_score_expert,
+            self.score_master,
+            self.dx_score_master,
+            self.score_remaster,
+            self.dx_score_remaster,
+            self.song_id,
+            self.score_utage,
+            self.dx_score_utage,
+        )
+
+    @classmethod
+    def from_row(cls, row: Sequence) -> "SongData":
+        return cls(
+            row[0],
+            row[1],
+            row[2],
+            row[3],
+            row[4],
+            row[5],
+            row[6],
+            row[7],
+            row[8],
+            row[9],
+            row[10],
+            row[11],
+            row[12],
+            row[13],
+            row[14],
+            row[15],
+        )
@@ -0,0 +1,134 @@
+from operator import attrgetter, itemgetter
+from typing import Any, Callable, Optional
+
+from scraper.resources.database_schema import Table
+
+
+class StatementCache:
+    """
+    Builds the SQL text Database generates once per (table, column set, filter shape) and reuses it afterwards.
+
+    Handing sqlite3 the exact same text every time also lets its own prepared statement cache (see
+    ConnectionManager) skip re-preparing, so the per-row work left is binding the parameters.
+    """
+
+    def __init__(self) -> None:
+        self._statements: dict[tuple, str] = {}
+        self._columns: dict[tuple, tuple[str, ...]] = {}
+        self._binders: dict[tuple, Callable[[Any], tuple]] = {}
+
+    def _cached(self, cache: dict, key: tuple, build: Callable[[], Any]) -> Any:
+        value = cache.get(key)
+        if value is None:
+            value = cache[key] = build()
+        return value
+
+    def column_names(self, table: Table) -> tuple[str, ...]:
+        return self._cached(self._columns, (table.name,), lambda: tuple(col.name for col in table.columns))
+
+    def entity_columns(self, table: Table, entity_class: type) -> tuple[str, ...]:
+        """Table columns the entity class has a field for, in table order"""
+        return self._cached(self._columns, (table.name, entity_class), lambda: tuple(
+            col.name for col in table.columns if col.name in getattr(entity_class, "__dataclass_fields__", {})
+        ))
+
+    def insert_columns(self, table: Table, entity_class: type) -> tuple[str, ...]:
+        """Same as entity_columns, without the auto-generated primary key"""
+        return self._cached(self._columns, (table.name, entity_class, "insert"), lambda: tuple(
+            col.name for col in table.columns
+            if col.name in self.entity_columns(table, entity_class) and (not col.primary_key or not col.autoincrement)
+        ))
+
+    def binder(self, entity_class: type, columns: tuple[str, ...]) -> Callable[[Any], tuple]:
+        """
+        Function returning the entity's values for the given columns, in order, ready to be bound as parameters.
+
+        Generated models encode themselves with to_row() in COLUMNS order, the needed values are sliced or picked
+        out of that tuple. Other dataclasses fall back to reading the attributes.
+        """
+
+        def build() -> Callable[[Any], tuple]:
+            to_row = getattr(entity_class, "to_row", None)
+            row_columns: tuple[str, ...] = getattr(entity_class, "COLUMNS", ())
+            if to_row is None or not set(columns) <= set(row_columns):
+                if len(columns) == 1:
+                    return lambda entity: (getattr(entity, columns[0]),)
+                return attrgetter(*columns)
+
+            if columns == row_columns:
+                return to_row
+            positions = [row_columns.index(col) for col in columns]
+            start = positions[0]
+            if positions == list(range(start, start + len(positions))):
+                stop = start + len(positions)
+                return lambda entity: to_row(entity)[start:stop]
+            if len(positions) == 1:
+                return lambda entity: (to_row(entity)[start],)
+            pick = itemgetter(*positions)
+            return lambda entity: pick(to_row(entity))
+
+        return self._cached(self._binders, (entity_class, columns), build)
+
+    def insert_sql(self, table: Table, columns: tuple[str, ...]) -> str:
+        return self._cached(self._statements, (table.name, "insert", columns), lambda: (
+            f"INSERT INTO {table.name} ({', '.join(columns)}) VALUES ({', '.join(['?'] * len(columns))})"
+        ))
+
+    def upsert_sql(self, table: Table, columns: tuple[str, ...], conflict_columns: tuple[str, ...]) -> str:
+        return self._cached(self._statements, (table.name, "upsert", columns, conflict_columns),
+                            lambda: table.generate_upsert_sql(list(columns), list(conflict_columns)))
+
+    def select_sql(self, table: Table, filter_columns: tuple[str, ...], limited: bool, after_id: bool = False) -> str:
+        """
+        SELECT * filtered by equality on the given columns. When after_id, only rows with an id above the parameter
+        following the filter values are selected, in id order. When limited, the LIMIT is the last parameter.
+        """
+
+        def build() -> str:
+            sql = f"SELECT * FROM {table.name}"
+            conditions = [f"{col}=?" for col in filter_columns] + (["id > ?"] if after_id else [])
+            if conditions:
+                sql += " WHERE " + ' AND '.join(conditions)
+            if after_id:
+                sql += " ORDER BY id"
+            if limited:
+                sql += " LIMIT ?"
+            return sql
+
+        return self._cached(self._statements, (table.name, "select", filter_columns, limited, after_id), build)
+
+    def compile_insert(self, table: Table, entity: Any) -> tuple[str, tuple]:
+        """INSERT statement and parameters for the entity"""
+        sql, bind = self.plan_insert(table, type(entity))
+        return sql, bind(entity)
+
+    def compile_upsert(self, table: Table, entity: Any) -> tuple[str, tuple]:
+        """Single-statement upsert and parameters for the entity, see plan_upsert"""
+        sql, bind = self.plan_upsert(table, entity)
+        return sql, bind(entity)
+
+    def plan_insert(self, table: Table, entity_class: type) -> tuple[str, Callable[[Any], tuple]]:
+        """INSERT statement for entities of the class, and the binder reading their parameters"""
+        columns = self.insert_columns(table, entity_class)
+        return self.insert_sql(table, columns), self.binder(entity_class, columns)
+
+    def plan_upsert(self, table: Table, entity: Any) -> tuple[str, Callable[[Any], tuple]]:
+        """
+        Single-statement upsert for the entity, see Table.generate_upsert_sql, and the binder reading its parameters.
+
+        The conflict target is the table's natural key if the entity sets all of it, else the id if set.
+        Without either, the statement is a plain insert. A None auto-increment id is never written.
+        """
+        entity_id: Optional[int] = getattr(entity, "id", None)
+        columns = self.entity_columns(table, type(entity))
+        if entity_id is None:
+            columns = self.insert_columns(table, type(entity))
+
+        conflict_key = self._cached(self._columns, (table.name, "conflict_key"), lambda: tuple(table.conflict_key))
+        if conflict_key and all(getattr(entity, col, None) is not None for col in conflict_key):
+            conflict_columns = conflict_key
+        elif entity_id is not None:
+            conflict_columns = ("id",)
+        else:
+            conflict_columns = ()
+        return self.upsert_sql(table, columns, conflict_columns), self.binder(type(entity), columns)
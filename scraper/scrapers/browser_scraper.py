@@ -1,29 +1,42 @@
 import logging
 import os
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import replace
 from typing import Optional
 
-from selenium.common.exceptions import TimeoutException
+import requests
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.support import expected_conditions as ec
 from selenium.webdriver.support.wait import WebDriverWait
 
 from scraper.constants import Endpoints
+from scraper.driver.driver_pool import DriverPool, SessionExpiredError
+from scraper.exception.scraper_exception import ScraperError
 from scraper.exception.terminate_exception import Terminate
+from scraper.login_session import get_requests_session_from_driver, is_session_expired
+from scraper.rating.dx_rating import ChartConstants, RatingEngine
+from scraper.resources.chart_registry import ChartRegistry
 from scraper.resources.database_schema import SONG_DATA_TABLE, PLAY_DATA_TABLE
 from scraper.resources.i18n.messages import Messages
-from scraper.resources.models import SongData, PlayData
+from scraper.resources.models import SongData, PlayRecord
 from scraper.resources.resource_manager import t, resources
 from scraper.scrapers.scraper import Scraper
+from scraper.utils import page_parser
 from scraper.utils import scraping_utils as su
+from scraper.utils.path_resolver import resolve_app_file_path
+from scraper.utils.poll_interval import AdaptivePollInterval
+from scraper.utils.request_scheduler import RequestScheduler
 
 logger = logging.getLogger(__name__.split(".")[-1])
 
 
 class BrowserScraper(Scraper):
-    def __init__(self, config, database, driver: WebDriver):
+    def __init__(self, config, database, driver: WebDriver, scheduler: Optional[RequestScheduler] = None,
+                 driver_pool: Optional[DriverPool] = None):
         """
         Browser-agnostic scraper using Selenium WebDriver. Configuration, database and driver is externalized
 
@@ -31,23 +44,60 @@ class BrowserScraper(Scraper):
             config (Config): App configuration.
             database (Database): Database connection instance.
             driver (WebDriver): Any Selenium WebDriver instance (Chrome, Firefox, headless, etc.)
+            scheduler (RequestScheduler, optional): Rate limiter for page loads. Built from config if not given.
+            driver_pool (DriverPool, optional): Extra drivers loading pages in parallel, sharing the login of driver.
+                Should be built with the same scheduler.
         """
         self.config = config
         self.database = database
         self.driver = driver
         self.wait_delay = self.config.get_int("UI_WAIT_DELAY", 5)
         self.wait_timeout = self.config.get_int("UI_WAIT_TIMEOUT", 15)
+        # When enabled, the browser only logs in. Pages are then fetched over plain HTTP and parsed locally
+        self.use_http_client = self.config.get_bool("USE_HTTP_CLIENT", False)
+        self.session: Optional[requests.Session] = None
+        self._session_lock = threading.Lock()
+        # Maximum number of playlog detail pages loaded at the same time (tabs or HTTP requests)
+        self.detail_concurrency = max(1, self.config.get_int("DETAIL_FETCH_CONCURRENCY", 3))
+        # Every page load goes through the scheduler instead of sleeping a fixed delay
+        self.scheduler = scheduler or RequestScheduler.from_config(self.config)
+        self.driver_pool = driver_pool
+        self.poll_interval = AdaptivePollInterval.from_config(self.config)
+        # Every idx stored in the database. Loaded once on the first check, then kept up to date on insert
+        self.known_idx: Optional[set[str]] = None
+        # Song and chart ids of the plays, resolved in memory
+        self.charts = ChartRegistry(self.database)
+        # Kept up to date as plays are stored. None when there is no chart constants file
+        self.rating_engine: Optional[RatingEngine] = self._load_rating_engine()
 
         logger.info(
             f"Scraper using [{self.driver.capabilities["browserName"]} {self.driver.capabilities["browserVersion"]}]")
         logger.debug(f"Wait delay : {self.wait_delay} | wait timeout : {self.wait_timeout}")
+        logger.debug(f"HTTP client : {self.use_http_client} | detail concurrency : {self.detail_concurrency}")
+        logger.debug(f"Page loads limited by {self.scheduler}")
+        logger.debug(f"Driver pool : {self.driver_pool}")
+        logger.debug(f"Records polled with {self.poll_interval}")
+
+    def _load_rating_engine(self) -> Optional[RatingEngine]:
+        constants_path = resolve_app_file_path(self.config.get("CHART_CONSTANTS_FILE", "chart_constants.json"))
+        if not os.path.exists(constants_path):
+            logger.info(f"No chart constants at {constants_path}, DX rating is not calculated")
+            return None
+        rating_engine = RatingEngine(ChartConstants.from_file(constants_path))
+        rating_engine.load(self.database)
+        return rating_engine
 
     def scrape(self) -> None:
         try:
             self.login()
-            # self.get_song_scores()
+            self._start_http_session()
+            if self.driver_pool is not None:
+                self.driver_pool.share_session(self.driver)
+            if self.config.get_bool("SCRAPE_SONG_SCORES", False):
+                self.get_song_scores()
             while True:
-                self.get_latest_records()
+                found_new = self.get_latest_records()
+                self._wait_for_next_check(self.poll_interval.next(found_new))
 
         except Exception as e:
             logger.error(f"Exception occurred {e}")
@@ -55,6 +105,8 @@ class BrowserScraper(Scraper):
 
     def _exit(self, exit_reason: str) -> None:
         logger.info(f"Exiting due to : {exit_reason}")
+        if self.driver_pool is not None:
+            self.driver_pool.close()
         self.driver.quit()
         raise Terminate()
 
@@ -67,6 +119,7 @@ class BrowserScraper(Scraper):
         Reminder : Always sleep awhile before doing any page interaction to make it less bot-like
         :return: True if login success
         """
+        self.scheduler.acquire()
         self.driver.get(Endpoints.LOGIN_PAGE)
 
         maintenance_dom = self.get_element_if_exists(By.CLASS_NAME, "main_info")
@@ -125,236 +178,313 @@ class BrowserScraper(Scraper):
                 return False
             return False
 
-    def get_song_scores(self):
-        # self.get_song_scores_by_difficulty("basic")
-        # self.get_song_scores_by_difficulty("advanced")
-        # self.get_song_scores_by_difficulty("expert")
-        # self.get_song_scores_by_difficulty("master")
-        # self.get_song_scores_by_difficulty("remaster")
-        # self.get_song_scores_by_difficulty("utage")
-        pass
-
-    def get_song_scores_by_difficulty(self, difficulty: str) -> None:
-        html_path = os.path.abspath(f"scraper/mock/song_scores_{difficulty}.html")
-        file_url = f"file:///{html_path.replace(os.sep, '/')}"  # Windows-safe
-        self.driver.get(file_url)
-        songs_dom = self.driver.find_elements(By.CLASS_NAME, f"music_{difficulty}_score_back")
-        for song_dom in songs_dom:
-            song_title = song_dom.find_element(By.CLASS_NAME, "music_name_block")
-            song_type = song_dom.find_element(By.XPATH, "..").find_element(By.CLASS_NAME,
-                                                                           "music_kind_icon").get_attribute("src")
-            score = song_dom.find_elements(By.CLASS_NAME, "music_score_block")
-
-            entity: SongData = self.database.select(SONG_DATA_TABLE,
-                                                    SongData(
-                                                        song_title=song_title.text,
-                                                        song_type=su.identify_song_type(song_type)
-                                                    ),
-                                                    SongData, 1)
-            if entity:
-                # TODO : Handle dont exists (never played before)
-                setattr(entity, f"score_{difficulty}", score[0].text)
-                setattr(entity, f"dx_score_{difficulty}", score[1].text)
-                self.database.upsert(SONG_DATA_TABLE, entity)
-            else:
-                song_data = SongData(
-                    song_title=song_title.text,
-                    song_type=su.identify_song_type(song_type)
-                )
-                setattr(song_data, f"score_{difficulty}", score[0].text)
-                setattr(song_data, f"dx_score_{difficulty}", score[1].text)
-                self.database.upsert(SONG_DATA_TABLE, entity)
-
-    def get_latest_records(self):
+    def _start_http_session(self) -> None:
+        """Hands the cookies of the logged in browser over to a plain HTTP client, if enabled"""
+        if not self.use_http_client:
+            return
+        self.session = get_requests_session_from_driver(self.driver)
+        logger.info("Using HTTP client for page fetching.")
+
+    def _fetch_html(self, url: str) -> str:
+        """
+        Fetch a page over the HTTP session. Logs in again through the browser once if the session expired.
+        Safe to call from multiple threads, only the first thread noticing the expiry logs in again.
+
+        :param url: Page to fetch
+        :return: Raw HTML of the page
+        """
+        for attempt in range(2):
+            session = self.session
+            self.scheduler.acquire()
+            response = session.get(url, timeout=self.wait_timeout)
+            response.raise_for_status()
+            if not is_session_expired(response):
+                response.encoding = response.encoding or "utf-8"
+                return response.text
+            if attempt == 0:
+                with self._session_lock:
+                    if self.session is session:
+                        logger.info("HTTP session expired. Logging in again.")
+                        if not self.login():
+                            break
+                        self._start_http_session()
+        raise ScraperError(f"Unable to fetch {url} : session expired")
+
+    def _load_page(self, url: str) -> str:
+        """
+        Load a page and return a single snapshot of its HTML for local parsing.
+
+        :param url: Page to load
+        :return: Raw HTML of the page
+        """
+        if self.session is not None:
+            return self._fetch_html(url)
+        self.scheduler.acquire()
+        self.driver.get(url)
+        return self.driver.page_source
+
+    def _load_pages(self, urls: list[str]) -> list[Optional[str]]:
+        """
+        Load several pages at once: over the HTTP session, on the driver pool, or else one by one in the browser.
+
+        :param urls: Pages to load
+        :return: Raw HTML of each page in the same order. None for pages the driver pool failed to load
+        """
+        if self.session is not None:
+            with ThreadPoolExecutor(max_workers=self.detail_concurrency) as executor:
+                return list(executor.map(self._fetch_html, urls))
+        if self.driver_pool is not None:
+            return self._fetch_in_pool(urls)
+        return [self._load_page(url) for url in urls]
+
+    def _fetch_in_pool(self, urls: list[str]) -> list[Optional[str]]:
+        """
+        Load the pages on the driver pool, all submitted at once. Logs in again through the browser once if the pooled
+        drivers were logged out.
+
+        :param urls: Pages to load
+        :return: Raw HTML of each page in the same order, None where its job failed
+        """
+        pages: dict[str, Optional[str]] = {}
+        for attempt in range(2):
+            futures = {url: self.driver_pool.fetch(url) for url in urls if url not in pages}
+            expired = False
+            for url, future in futures.items():
+                try:
+                    pages[url] = future.result()
+                except SessionExpiredError:
+                    expired = True
+                except WebDriverException as e:
+                    logger.error(f"Failed to load {url} : {e.msg}")
+                    pages[url] = None
+                except Exception as e:
+                    # A failed job, e.g. in the request scheduler, only loses its own page
+                    logger.error(f"Failed to load {url} : {e}")
+                    pages[url] = None
+            if not expired:
+                return [pages[url] for url in urls]
+            if attempt == 0:
+                logger.info("Pooled session expired. Logging in again.")
+                if not self.login():
+                    break
+                self.driver_pool.share_session(self.driver)
+        raise ScraperError("Unable to load pages on the driver pool : session expired")
+
+    def get_song_scores(self) -> int:
+        """
+        Refresh song_data from the score page of every difficulty. Each page is parsed in one pass, compared with the
+        stored rows in memory, and only the songs whose scores changed are written, in a single transaction.
+
+        :return: Number of songs written
+        """
+        difficulties = list(page_parser.ScoreSelectors.SONGS)
+        pages = self._load_pages([getattr(Endpoints, f"SONG_SCORES_{difficulty.upper()}")
+                                  for difficulty in difficulties])
+
+        stored = {(song_data.song_title, song_data.song_type): song_data
+                  for song_data in self.database.iter_select(SONG_DATA_TABLE, None, SongData)}
+        changed: dict[tuple[str, str], SongData] = {}
+        for difficulty, html in zip(difficulties, pages):
+            if html is None:
+                continue
+            score_column, dx_score_column = f"score_{difficulty}", f"dx_score_{difficulty}"
+            for key, (score, dx_score) in page_parser.parse_song_scores_page(html, difficulty).items():
+                song_data = changed.get(key) or stored.get(key) or SongData(song_title=key[0], song_type=key[1])
+                if (getattr(song_data, score_column), getattr(song_data, dx_score_column)) == (score, dx_score):
+                    continue
+                if key not in changed:
+                    # Written by natural key, the stored row is left as loaded
+                    song_data = changed[key] = replace(song_data, id=None)
+                setattr(song_data, score_column, score)
+                setattr(song_data, dx_score_column, dx_score)
+
+        with self.database.unit_of_work() as uow:
+            # Stores the songs first seen on these pages along with their scores
+            self.charts.assign_songs(uow, changed.values())
+            for song_data in changed.values():
+                uow.upsert(SONG_DATA_TABLE, song_data)
+        logger.info(f"Song scores refreshed : {len(changed)} of {len(stored)} stored song(s) changed or added")
+        return len(changed)
+
+    def get_latest_records(self) -> bool:
+        """
+        Store new plays from the records page with their details. Every write of the check is committed in a single
+        transaction.
+
+        :return: True if new plays were found
+        """
         # html_path = os.path.abspath("scraper/mock/records.html")
         # file_url = f"file:///{html_path.replace(os.sep, '/')}"
         # self.driver.get(file_url)
-        self.driver.get(Endpoints.RECORDS)
-        records_dom = self.driver.find_elements(By.CLASS_NAME, "playlog_top_container")
-        available_idx = []
-        new_idx = []
-        for playlog_top_dom in reversed(records_dom):
-            playlog_song_container = (
-                playlog_top_dom
-                .find_element(By.XPATH, "..")
-                .find_elements(By.XPATH, "./*")[1]
-            )
-            idx = su.find_element_attribute(playlog_song_container, By.XPATH, ".//form/input[@name='idx']", "value")
-            available_idx.append(idx)
-            if not self.database.check_if_play_data_exists(idx):
-                new_idx.append(idx)
-                play_data = PlayData(
-                    idx=idx,
-                    title=su.parse_song_title(playlog_song_container.find_element(By.CSS_SELECTOR, ".basic_block")),
-                    difficulty=su.find_element_attribute(playlog_song_container, By.CSS_SELECTOR, ".playlog_level_icon",
-                                                         "text"),
-                    track=su.find_element_attribute(playlog_top_dom, By.CSS_SELECTOR, ".sub_title span", "text", 0),
-                    music_type=su.parse_chart_type(
-                        su.find_element_attribute(playlog_song_container, By.CLASS_NAME, "playlog_music_kind_icon",
-                                                  "src")
-                    ),
-                    new_achievement=bool(
-                        playlog_song_container.find_elements(By.CSS_SELECTOR, ".playlog_achievement_newrecord")),
-                    achievement=su.find_element_attribute(playlog_song_container, By.CSS_SELECTOR,
-                                                          ".playlog_achievement_txt", "text"),
-                    rank=su.parse_rank(
-                        su.find_element_attribute(playlog_song_container, By.CSS_SELECTOR, ".playlog_scorerank", "src")
-                    ),
-                    new_dx_score=bool(
-                        playlog_song_container.find_elements(By.CSS_SELECTOR, ".playlog_deluxscore_newrecord")),
-                    dx_score=su.find_element_attribute(playlog_song_container, By.CSS_SELECTOR,
-                                                       ".playlog_score_block .white", "text"),
-                    dx_stars=su.parse_dx_stars(
-                        su.find_element_attribute(playlog_song_container, By.CSS_SELECTOR,
-                                                  ".playlog_score_block .playlog_deluxscore_star", "src")
-                    ),
-                    combo_status=su.parse_combo(
-                        su.find_element_attribute(playlog_song_container, By.CSS_SELECTOR,
-                                                  ".playlog_result_innerblock img", "src", -2)
-                    ),
-                    sync_status=su.parse_sync(
-                        su.find_element_attribute(playlog_song_container, By.CSS_SELECTOR,
-                                                  ".playlog_result_innerblock img", "src", -1)
-                    ),
-                    place=su.parse_placement(
-                        playlog_song_container.find_elements(By.CSS_SELECTOR, ".playlog_matching_icon")
-                    ),
-                    played_at=su.find_element_attribute(playlog_top_dom, By.CSS_SELECTOR, ".sub_title span", "text", 1),
-                    detailed=False,
-                    play_data_version=resources.play_data_version
-                )
-                self.database.upsert(PLAY_DATA_TABLE, play_data)
-        if new_idx:
+        if self.known_idx is None:
+            self.known_idx = self.database.get_all_play_data_idx()
+            logger.info(f"Loaded {len(self.known_idx)} stored play logs")
+
+        records_html = self._load_page(Endpoints.RECORDS)
+        available_idx, new_play_data = page_parser.parse_records_page(records_html, resources.play_data_version,
+                                                                      self.known_idx)
+        new_idx = {play_data.idx for play_data in new_play_data}
+        if new_play_data:
             logger.info("New records found. Appending details")
-            self._parse_song_details(new_idx)
-        # Additional loop to add details if for some reason it didn't get detailed
-        for idx in available_idx:
-            play_data: PlayData = self.database.select(PLAY_DATA_TABLE, {"idx": idx}, PlayData)
-            if not play_data.detailed:
-                logger.info("Orphaned records found with details still available found. Appending details")
-                self._parse_song_details([idx], play_data)
-        if not new_idx:
-            # Nothing new in this loop. Injecting a timer and sleeping
-            interval = 5 * 60  # 5 minutes interval, should be long enough even if every song is skipped non-stop
-            countdown_script = f'''
-            (function() {{
-                let box = document.getElementById('countdown-box') || (() => {{
-                    let b = document.createElement('div');
-                    b.id = 'countdown-box';
-                    Object.assign(b.style, {{
-                        position: 'fixed', top: '10px', right: '10px',
-                        padding: '10px 15px', background: 'rgba(0,0,0,0.7)',
-                        color: 'white', fontSize: '16px', borderRadius: '8px',
-                        zIndex: 9999, cursor: 'move'
-                    }});
-                    b.innerText = 'Next check in...';
-                    document.body.appendChild(b);
-                    return b;
-                }})();
-
-                let isDragging = false, offsetX = 0, offsetY = 0;
-
-                box.onmousedown = e => {{
-                    isDragging = true;
-                    offsetX = e.clientX - box.getBoundingClientRect().left;
-                    offsetY = e.clientY - box.getBoundingClientRect().top;
-                    box.style.transition = 'none';
-                }};
-
-                document.onmousemove = e => {{
-                    if(isDragging){{
-                        box.style.left = (e.clientX - offsetX) + 'px';
-                        box.style.top = (e.clientY - offsetY) + 'px';
-                        box.style.right = 'auto';
-                    }}
-                }};
-
-                document.onmouseup = () => {{ isDragging = false; }};
-
-                let seconds = {interval}; 
-                box.innerText = `Next check in ${'{'}seconds{'}'}s`;
-
-                let id = setInterval(() => {{
-                    seconds--;
-                    if(seconds <= 0){{ clearInterval(id); box.remove(); }}
-                    else {{ box.innerText = `Next check in ${'{'}seconds{'}'}s`; }}
-                }}, 1000);
+            new_play_data = self._parse_song_details(new_play_data)
+        # Add details to stored plays that for some reason didn't get detailed, while the page still lists them
+        orphans = {play_data.idx: play_data for play_data in
+                   self.database.find_undetailed_plays(idx for idx in available_idx if idx not in new_idx)}
+        orphaned_play_data: list[PlayRecord] = [orphans[idx] for idx in available_idx if idx in orphans]
+        if orphaned_play_data:
+            logger.info("Orphaned records found with details still available found. Appending details")
+            orphaned_play_data = [play_data for play_data in self._parse_song_details(orphaned_play_data)
+                                  if play_data.detailed]
+
+        with self.database.unit_of_work() as uow:
+            # Stores the charts first seen in this check along with the plays, drops plays that cannot have one
+            new_play_data = self.charts.assign_charts(uow, new_play_data)
+            # New plays are stored even without details, the next check picks them up as orphans
+            for play_data in new_play_data + orphaned_play_data:
+                uow.upsert(PLAY_DATA_TABLE, play_data)
+        self.known_idx.update(new_idx)
+
+        if self.rating_engine is not None and self.rating_engine.update_all(new_play_data):
+            logger.info(f"DX rating : {self.rating_engine.rating}")
+        return bool(new_idx)
+
+    def _wait_for_next_check(self, interval: int) -> None:
+        """Injects a countdown timer into the page and sleeps until the next check"""
+        countdown_script = f'''
+        (function() {{
+            let box = document.getElementById('countdown-box') || (() => {{
+                let b = document.createElement('div');
+                b.id = 'countdown-box';
+                Object.assign(b.style, {{
+                    position: 'fixed', top: '10px', right: '10px',
+                    padding: '10px 15px', background: 'rgba(0,0,0,0.7)',
+                    color: 'white', fontSize: '16px', borderRadius: '8px',
+                    zIndex: 9999, cursor: 'move'
+                }});
+                b.innerText = 'Next check in...';
+                document.body.appendChild(b);
+                return b;
             }})();
-            '''
-            self.driver.execute_script(countdown_script)
-            logger.info(f"Waiting {interval} seconds before next check...")
-            time.sleep(interval)
-
-    def _parse_song_details(self, new_idx: list[str], optional_data: Optional[PlayData] = None) -> None:
-        for idx in new_idx:
-            # endpoint = Endpoints.RECORD_DETAILS(idx)
-            # html_path = os.path.abspath("scraper/mock/record_details.html")
-            # file_url = f"file:///{html_path.replace(os.sep, '/')}"
-            # Delay between page loading
-            # self.driver.get(file_url)
-            self.driver.get(Endpoints.RECORD_DETAILS(idx))
-            time.sleep(self.wait_delay)
-
-            # Fetch the existing entity for updates
-            if optional_data:
-                play_data = optional_data
-            else:
-                play_data: PlayData = self.database.select(PLAY_DATA_TABLE, {"idx": idx}, PlayData)
-
-            if play_data:
-                details_dom = self.driver.find_elements(By.CLASS_NAME, "gray_block")[0]
-
-                tap_selector = ".playlog_notes_detail tr:nth-child(2) td"
-                hold_selector = ".playlog_notes_detail tr:nth-child(3) td"
-                slide_selector = ".playlog_notes_detail tr:nth-child(4) td"
-                touch_selector = ".playlog_notes_detail tr:nth-child(5) td"
-                break_selector = ".playlog_notes_detail tr:nth-child(6) td"
-                combo_string = su.find_element_attribute(details_dom, By.CSS_SELECTOR, ".playlog_score_block > div",
-                                                         "text", 0)
-                combo = combo_string.split("/")[0] if "/" in combo_string else combo_string
-                max_combo = combo_string.split("/")[1] if "/" in combo_string else combo_string
-                sync_string = su.find_element_attribute(details_dom, By.CSS_SELECTOR, ".playlog_score_block > div",
-                                                        "text", 1)
-                sync = sync_string.split("/")[0] if "/" in sync_string else sync_string
-                max_sync = sync_string.split("/")[1] if "/" in sync_string else sync_string
-                play_data = replace(
-                    play_data,
-                    fast=su.find_element_attribute(details_dom, By.CSS_SELECTOR, ".playlog_fl_block div div", "text",
-                                                   0),
-                    late=su.find_element_attribute(details_dom, By.CSS_SELECTOR, ".playlog_fl_block div div", "text",
-                                                   1),
-                    tap_critical=su.find_element_attribute(details_dom, By.CSS_SELECTOR, tap_selector, "text", 0),
-                    tap_perfect=su.find_element_attribute(details_dom, By.CSS_SELECTOR, tap_selector, "text", 1),
-                    tap_great=su.find_element_attribute(details_dom, By.CSS_SELECTOR, tap_selector, "text", 2),
-                    tap_good=su.find_element_attribute(details_dom, By.CSS_SELECTOR, tap_selector, "text", 3),
-                    tap_miss=su.find_element_attribute(details_dom, By.CSS_SELECTOR, tap_selector, "text", 4),
-                    hold_critical=su.find_element_attribute(details_dom, By.CSS_SELECTOR, hold_selector, "text", 0),
-                    hold_perfect=su.find_element_attribute(details_dom, By.CSS_SELECTOR, hold_selector, "text", 1),
-                    hold_great=su.find_element_attribute(details_dom, By.CSS_SELECTOR, hold_selector, "text", 2),
-                    hold_good=su.find_element_attribute(details_dom, By.CSS_SELECTOR, hold_selector, "text", 3),
-                    hold_miss=su.find_element_attribute(details_dom, By.CSS_SELECTOR, hold_selector, "text", 4),
-                    slide_critical=su.find_element_attribute(details_dom, By.CSS_SELECTOR, slide_selector, "text", 0),
-                    slide_perfect=su.find_element_attribute(details_dom, By.CSS_SELECTOR, slide_selector, "text", 1),
-                    slide_great=su.find_element_attribute(details_dom, By.CSS_SELECTOR, slide_selector, "text", 2),
-                    slide_good=su.find_element_attribute(details_dom, By.CSS_SELECTOR, slide_selector, "text", 3),
-                    slide_miss=su.find_element_attribute(details_dom, By.CSS_SELECTOR, slide_selector, "text", 4),
-                    touch_critical=su.find_element_attribute(details_dom, By.CSS_SELECTOR, touch_selector, "text", 0),
-                    touch_perfect=su.find_element_attribute(details_dom, By.CSS_SELECTOR, touch_selector, "text", 1),
-                    touch_great=su.find_element_attribute(details_dom, By.CSS_SELECTOR, touch_selector, "text", 2),
-                    touch_good=su.find_element_attribute(details_dom, By.CSS_SELECTOR, touch_selector, "text", 3),
-                    touch_miss=su.find_element_attribute(details_dom, By.CSS_SELECTOR, touch_selector, "text", 4),
-                    break_critical=su.find_element_attribute(details_dom, By.CSS_SELECTOR, break_selector, "text", 0),
-                    break_perfect=su.find_element_attribute(details_dom, By.CSS_SELECTOR, break_selector, "text", 1),
-                    break_great=su.find_element_attribute(details_dom, By.CSS_SELECTOR, break_selector, "text", 2),
-                    break_good=su.find_element_attribute(details_dom, By.CSS_SELECTOR, break_selector, "text", 3),
-                    break_miss=su.find_element_attribute(details_dom, By.CSS_SELECTOR, break_selector, "text", 4),
-                    combo=combo,
-                    max_combo=max_combo,
-                    sync=sync,
-                    max_sync=max_sync,
-                    detailed=True
-                )
-                self.database.upsert(PLAY_DATA_TABLE, play_data)
 
+            let isDragging = false, offsetX = 0, offsetY = 0;
+
+            box.onmousedown = e => {{
+                isDragging = true;
+                offsetX = e.clientX - box.getBoundingClientRect().left;
+                offsetY = e.clientY - box.getBoundingClientRect().top;
+                box.style.transition = 'none';
+            }};
+
+            document.onmousemove = e => {{
+                if(isDragging){{
+                    box.style.left = (e.clientX - offsetX) + 'px';
+                    box.style.top = (e.clientY - offsetY) + 'px';
+                    box.style.right = 'auto';
+                }}
+            }};
+
+            document.onmouseup = () => {{ isDragging = false; }};
+
+            let seconds = {interval}; 
+            box.innerText = `Next check in ${'{'}seconds{'}'}s`;
+
+            let id = setInterval(() => {{
+                seconds--;
+                if(seconds <= 0){{ clearInterval(id); box.remove(); }}
+                else {{ box.innerText = `Next check in ${'{'}seconds{'}'}s`; }}
+            }}, 1000);
+        }})();
+        '''
+        self.driver.execute_script(countdown_script)
+        logger.info(f"Waiting {interval} seconds before next check...")
+        time.sleep(interval)
+
+    def _parse_song_details(self, play_data_list: list[PlayRecord]) -> list[PlayRecord]:
+        """
+        Fetch the detail pages of the given plays concurrently and merge the details into them.
+
+        :param play_data_list: Plays to detail, oldest first
+        :return: The plays in the same (idx) order, detailed where the details page could be read
+        """
+        # endpoint = Endpoints.RECORD_DETAILS(idx)
+        # html_path = os.path.abspath("scraper/mock/record_details.html")
+        # file_url = f"file:///{html_path.replace(os.sep, '/')}"
+        # self.driver.get(file_url)
+        details_by_idx = self._fetch_song_details([play_data.idx for play_data in play_data_list])
+
+        detailed_play_data = []
+        for play_data in play_data_list:
+            details = details_by_idx.get(play_data.idx)
+            if details is None:
+                logger.error(f"Details for {play_data.idx} not found on page")
+                detailed_play_data.append(play_data)
             else:
-                logger.error(f"Play data for {idx} not found in database")
+                detailed_play_data.append(replace(play_data, **details, detailed=True))
+        return detailed_play_data
+
+    def _fetch_song_details(self, idx_list: list[str]) -> dict[str, Optional[dict]]:
+        """
+        Load up to detail_concurrency playlog detail pages at a time, or one per pooled driver.
+
+        :param idx_list: Playlog idx values to fetch
+        :return: Parsed details keyed by idx, None for pages without details
+        """
+        if self.session is not None:
+            def fetch(idx: str) -> Optional[dict]:
+                try:
+                    return page_parser.parse_record_details(self._fetch_html(Endpoints.RECORD_DETAILS(idx)))
+                except (requests.RequestException, ScraperError) as e:
+                    # Stays undetailed, picked up as an orphan by the next check
+                    logger.error(f"Failed to fetch details for {idx} : {e}")
+                    return None
+
+            with ThreadPoolExecutor(max_workers=self.detail_concurrency) as executor:
+                return dict(zip(idx_list, executor.map(fetch, idx_list)))
+
+        if self.driver_pool is not None:
+            pages = self._fetch_in_pool([Endpoints.RECORD_DETAILS(idx) for idx in idx_list])
+            return {idx: page_parser.parse_record_details(html) if html is not None else None
+                    for idx, html in zip(idx_list, pages)}
+
+        details_by_idx = {}
+        for start in range(0, len(idx_list), self.detail_concurrency):
+            details_by_idx.update(self._fetch_song_details_in_tabs(idx_list[start:start + self.detail_concurrency]))
+        return details_by_idx
+
+    def _fetch_song_details_in_tabs(self, idx_batch: list[str]) -> dict[str, Optional[dict]]:
+        """Open one tab per idx so the browser loads them in parallel, then read and close them one by one"""
+        main_handle = self.driver.current_window_handle
+        handles = {}
+        for idx in idx_batch:
+            existing_handles = set(self.driver.window_handles)
+            self.scheduler.acquire()
+            self.driver.execute_script("window.open(arguments[0], '_blank');", Endpoints.RECORD_DETAILS(idx))
+            WebDriverWait(self.driver, self.wait_timeout).until(ec.new_window_is_opened(list(existing_handles)))
+            handles[idx] = (set(self.driver.window_handles) - existing_handles).pop()
+
+        details_by_idx = {}
+        try:
+            for idx, handle in handles.items():
+                self.driver.switch_to.window(handle)
+                try:
+                    WebDriverWait(self.driver, self.wait_timeout).until(
+                        lambda driver: driver.execute_script("return document.readyState;") == "complete"
+                    )
+                except TimeoutException:
+                    logger.error(f"Timed out loading details for {idx}")
+                    details_by_idx[idx] = None
+                    continue
+                details_by_idx[idx] = self._read_song_details_from_driver()
+        finally:
+            for handle in set(handles.values()) & set(self.driver.window_handles):
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+            self.driver.switch_to.window(main_handle)
+        return details_by_idx
+
+    def _read_song_details_from_driver(self) -> Optional[dict]:
+        """Reads the playlog detail page currently loaded in the driver with a single script execution"""
+        raw_details = self.driver.execute_script(su.RECORD_DETAILS_SCRIPT, len(su.NOTE_TYPES))
+        if not raw_details:
+            return None
+        return su.parse_record_details(raw_details["fast_late"], raw_details["notes"], raw_details["score_block"])
@@ -0,0 +1,201 @@
+import logging
+from typing import Container, Optional
+
+import soupsieve as sv
+from bs4 import BeautifulSoup, Tag
+from soupsieve import SoupSieve
+
+from scraper.constants import PlayedAt
+from scraper.resources.models import PlayRecord
+from scraper.utils import scraping_utils as su
+
+logger = logging.getLogger(__name__.split(".")[-1])
+
+HTML_PARSER = "html.parser"
+
+
+class RecordSelectors:
+    """Selectors of the records page, compiled once at import"""
+    PLAYLOG_TOP = sv.compile(".playlog_top_container")
+    IDX = sv.compile("form > input[name='idx']")
+    TITLE = sv.compile(".basic_block")
+    DIFFICULTY = sv.compile(".playlog_level_icon")
+    SUB_TITLE = sv.compile(".sub_title span")
+    MUSIC_KIND = sv.compile(".playlog_music_kind_icon")
+    NEW_ACHIEVEMENT = sv.compile(".playlog_achievement_newrecord")
+    ACHIEVEMENT = sv.compile(".playlog_achievement_txt")
+    RANK = sv.compile(".playlog_scorerank")
+    NEW_DX_SCORE = sv.compile(".playlog_deluxscore_newrecord")
+    DX_SCORE = sv.compile(".playlog_score_block .white")
+    DX_STARS = sv.compile(".playlog_score_block .playlog_deluxscore_star")
+    RESULT_ICONS = sv.compile(".playlog_result_innerblock img")
+    MATCHING_ICON = sv.compile(".playlog_matching_icon")
+
+
+class DetailSelectors:
+    """Selectors of the playlog detail page, compiled once at import"""
+    DETAILS = sv.compile(".gray_block")
+    FAST_LATE = sv.compile(".playlog_fl_block div div")
+    NOTE_ROWS = [
+        sv.compile(f".playlog_notes_detail tr:nth-child({row}) td") for row in range(2, 2 + len(su.NOTE_TYPES))
+    ]
+    SCORE_BLOCK = sv.compile(".playlog_score_block > div")
+
+
+class ScoreSelectors:
+    """Selectors of the song score pages (Endpoints.SONG_SCORES_*), compiled once at import"""
+    SONGS = {
+        difficulty: sv.compile(f".music_{difficulty}_score_back")
+        for difficulty in ["basic", "advanced", "expert", "master", "remaster", "utage"]
+    }
+    NAME = sv.compile(".music_name_block")
+    SCORES = sv.compile(".music_score_block")
+    MUSIC_KIND = sv.compile(".music_kind_icon")
+
+
+def find_text(container: Tag, selector: SoupSieve, index: int = 0) -> str | None:
+    """Local (BeautifulSoup) counterpart of scraping_utils.find_element_attribute(..., "text", index)."""
+    element = _find(container, selector, index)
+    return element.get_text(strip=True) if element is not None else None
+
+
+def find_attribute(container: Tag, selector: SoupSieve, attr: str, index: int = 0) -> str | None:
+    """Local (BeautifulSoup) counterpart of scraping_utils.find_element_attribute(..., attr, index)."""
+    element = _find(container, selector, index)
+    return element.get(attr) if element is not None else None
+
+
+def _find(container: Tag, selector: SoupSieve, index: int) -> Tag | None:
+    if index == 0:
+        element = selector.select_one(container)
+    else:
+        elements = selector.select(container)
+        element = elements[index] if -len(elements) <= index < len(elements) else None
+    if element is None:
+        logger.debug("_find :: No element at index %s (selector=%s)", index, selector.pattern)
+    return element
+
+
+def parse_song_title(element: Tag | None) -> str | None:
+    """Song title is the text of the block itself, excluding the text of its child elements"""
+    if element is None:
+        return None
+    return "".join(element.find_all(string=True, recursive=False)).strip()
+
+
+def parse_records_page(html: str, play_data_version: int,
+                       known_idx: Optional[Container[str]] = None) -> tuple[list[str], list[PlayRecord]]:
+    """
+    Parse the records page into PlayRecord entities without details.
+
+    The page lists the newest play first. Parsing into PlayRecord stops at the first idx found in known_idx (the
+    watermark), since every play older than an already stored one is stored as well.
+
+    Args:
+        html (str): Raw HTML of Endpoints.RECORDS
+        play_data_version (int): Version to stamp on every entity
+        known_idx (Container[str], optional): idx values already stored. If None, every play is parsed.
+
+    Returns:
+        tuple[list[str], list[PlayRecord]]: Every idx on the page, and the plays newer than the watermark.
+        Both oldest play first, same order the browser scraper processes them in
+    """
+    soup = BeautifulSoup(html, HTML_PARSER)
+    available_idx = []
+    records = []
+    watermark_reached = False
+    for playlog_top_dom in RecordSelectors.PLAYLOG_TOP.select(soup):
+        siblings = playlog_top_dom.parent.find_all(recursive=False)
+        if len(siblings) < 2:
+            logger.debug("parse_records_page :: Playlog container without song block, skipping")
+            continue
+        playlog_song_container = siblings[1]
+        idx = find_attribute(playlog_song_container, RecordSelectors.IDX, "value")
+        available_idx.append(idx)
+        if watermark_reached or (known_idx is not None and idx in known_idx):
+            watermark_reached = True
+            continue
+
+        result_icons = RecordSelectors.RESULT_ICONS.select(playlog_song_container)
+        achievement = find_text(playlog_song_container, RecordSelectors.ACHIEVEMENT)
+        dx_score = find_text(playlog_song_container, RecordSelectors.DX_SCORE)
+        dx_score_value, dx_score_max = su.parse_dx_score(dx_score)
+        played_at = find_text(playlog_top_dom, RecordSelectors.SUB_TITLE, 1)
+        records.append(PlayRecord(
+            idx=idx,
+            title=parse_song_title(RecordSelectors.TITLE.select_one(playlog_song_container)),
+            difficulty=find_text(playlog_song_container, RecordSelectors.DIFFICULTY),
+            track=find_text(playlog_top_dom, RecordSelectors.SUB_TITLE, 0),
+            music_type=su.parse_chart_type(
+                find_attribute(playlog_song_container, RecordSelectors.MUSIC_KIND, "src") or ""
+            ),
+            new_achievement=RecordSelectors.NEW_ACHIEVEMENT.select_one(playlog_song_container) is not None,
+            achievement=achievement,
+            rank=su.parse_rank(find_attribute(playlog_song_container, RecordSelectors.RANK, "src") or ""),
+            new_dx_score=RecordSelectors.NEW_DX_SCORE.select_one(playlog_song_container) is not None,
+            dx_score=dx_score,
+            dx_stars=su.parse_dx_stars(find_attribute(playlog_song_container, RecordSelectors.DX_STARS, "src")),
+            combo_status=su.parse_combo(result_icons[-2].get("src") if len(result_icons) >= 2 else None),
+            sync_status=su.parse_sync(result_icons[-1].get("src") if result_icons else None),
+            place=su.parse_placement_icon(find_attribute(playlog_song_container, RecordSelectors.MATCHING_ICON, "src")),
+            played_at=played_at,
+            detailed=False,
+            play_data_version=play_data_version,
+            achievement_value=su.parse_achievement_value(achievement),
+            dx_score_value=dx_score_value,
+            dx_score_max=dx_score_max,
+            played_at_epoch=su.parse_played_at(played_at, PlayedAt.FORMAT, PlayedAt.UTC_OFFSET_HOURS),
+        ))
+    available_idx.reverse()
+    records.reverse()
+    return available_idx, records
+
+
+def parse_record_details(html: str) -> dict | None:
+    """
+    Parse a playlog detail page.
+
+    Args:
+        html (str): Raw HTML of Endpoints.RECORD_DETAILS(idx)
+
+    Returns:
+        dict | None: PlayRecord field values (see scraping_utils.parse_record_details), or None if the page has no
+        detail block
+    """
+    soup = BeautifulSoup(html, HTML_PARSER)
+    details_dom = DetailSelectors.DETAILS.select_one(soup)
+    if details_dom is None:
+        return None
+
+    fast_late = [element.get_text(strip=True) for element in DetailSelectors.FAST_LATE.select(details_dom)]
+    notes = [
+        [cell.get_text(strip=True) for cell in row_selector.select(details_dom)]
+        for row_selector in DetailSelectors.NOTE_ROWS
+    ]
+    score_block = [element.get_text(strip=True) for element in DetailSelectors.SCORE_BLOCK.select(details_dom)]
+    return su.parse_record_details(fast_late, notes, score_block)
+
+
+def parse_song_scores_page(html: str, difficulty: str) -> dict[tuple[str, str], tuple[str, str]]:
+    """
+    Parse the score page of one difficulty, every song in one pass.
+
+    Args:
+        html (str): Raw HTML of the Endpoints.SONG_SCORES_* page of the difficulty
+        difficulty (str): One of ScoreSelectors.SONGS
+
+    Returns:
+        dict[tuple[str, str], tuple[str, str]]: (score, dx score) texts keyed by (song title, song type). Songs
+        never played on the difficulty have no score and are left out
+    """
+    soup = BeautifulSoup(html, HTML_PARSER)
+    scores = {}
+    for song_dom in ScoreSelectors.SONGS[difficulty].select(soup):
+        score_doms = ScoreSelectors.SCORES.select(song_dom)
+        if len(score_doms) < 2:
+            continue
+        song_title = find_text(song_dom, ScoreSelectors.NAME)
+        # The type icon sits next to the score block, not inside it
+        song_type = su.identify_song_type(find_attribute(song_dom.parent, ScoreSelectors.MUSIC_KIND, "src") or "")
+        scores[(song_title, song_type)] = (score_doms[0].get_text(strip=True), score_doms[1].get_text(strip=True))
+    return scores
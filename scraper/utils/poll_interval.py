@@ -0,0 +1,69 @@
+import logging
+
+logger = logging.getLogger(__name__.split(".")[-1])
+
+
+class AdaptivePollInterval:
+    """
+    Decides how long to wait before checking the records page again.
+
+    Polls at the short active interval while new plays keep showing up. Once a check finds nothing new, the interval
+    starts over from the idle interval and backs off exponentially for every further idle check, up to the maximum.
+    """
+
+    def __init__(self, active_seconds: int, idle_seconds: int, max_seconds: int, backoff: float = 2.0) -> None:
+        """
+        Args:
+            active_seconds (int): Interval right after new plays were found.
+            idle_seconds (int): First interval once the checks stop finding new plays.
+            max_seconds (int): Upper bound of the interval while idle.
+            backoff (float): Factor the interval grows by for every idle check.
+        """
+        if active_seconds <= 0:
+            raise ValueError(f"Active poll interval must be positive, got {active_seconds}")
+        if idle_seconds < active_seconds:
+            raise ValueError(f"Idle poll interval {idle_seconds} is below the active interval {active_seconds}")
+        if max_seconds < idle_seconds:
+            raise ValueError(f"Maximum poll interval {max_seconds} is below the idle interval {idle_seconds}")
+        if backoff < 1:
+            raise ValueError(f"Poll backoff must be at least 1, got {backoff}")
+
+        self.active_seconds = active_seconds
+        self.idle_seconds = idle_seconds
+        self.max_seconds = max_seconds
+        self.backoff = backoff
+        self._current = active_seconds
+        self._active = True
+
+    @classmethod
+    def from_config(cls, config) -> "AdaptivePollInterval":
+        return cls(
+            config.get_int("MIN_CHECK_INTERVAL_SECONDS", 30),
+            config.get_int("CHECK_INTERVAL_MINUTES", 5) * 60,
+            config.get_int("MAX_CHECK_INTERVAL_MINUTES", 60) * 60,
+            config.get_float("CHECK_INTERVAL_BACKOFF", 2.0),
+        )
+
+    def next(self, found_new: bool) -> int:
+        """
+        Args:
+            found_new (bool): Whether the last check found new plays.
+
+        Returns:
+            int: Seconds to wait before the next check
+        """
+        if found_new:
+            self._current = self.active_seconds
+        elif not self._active:
+            # Only start backing off after the first idle check, in case the player is between songs
+            if self._current < self.idle_seconds:
+                self._current = self.idle_seconds
+            else:
+                self._current = min(self.max_seconds, int(self._current * self.backoff))
+        self._active = found_new
+        logger.debug(f"Next poll in {self._current} seconds (found new : {found_new})")
+        return self._current
+
+    def __repr__(self):
+        return (f"AdaptivePollInterval(active={self.active_seconds}s, idle={self.idle_seconds}s, "
+                f"max={self.max_seconds}s, backoff={self.backoff})")
@@ -0,0 +1,64 @@
+import logging
+import threading
+import time
+from typing import Callable
+
+logger = logging.getLogger(__name__.split(".")[-1])
+
+
+class RequestScheduler:
+    """
+    Token bucket every page fetch goes through, so all fetches share one rate limit no matter how many run in parallel.
+
+    Tokens refill continuously at `rate` per second up to `burst`. A fetch takes one token, waiting for it if the
+    bucket is empty. Tokens are reserved under a lock and waited on outside of it, so concurrent callers queue up
+    fairly without holding each other back.
+    """
+
+    def __init__(self, rate: float, burst: int = 1, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep) -> None:
+        """
+        Args:
+            rate (float): Requests per second allowed on average.
+            burst (int): Requests that can be made back to back after an idle period.
+            clock (Callable): Monotonic clock in seconds, overridable for testing.
+            sleep (Callable): Sleep function, overridable for testing.
+        """
+        if rate <= 0:
+            raise ValueError(f"Request rate must be positive, got {rate}")
+        if burst < 1:
+            raise ValueError(f"Request burst must be at least 1, got {burst}")
+
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens: float = burst
+        self._updated = clock()
+
+    @classmethod
+    def from_config(cls, config) -> "RequestScheduler":
+        return cls(config.get_float("REQUESTS_PER_SECOND", 0.5), config.get_int("REQUEST_BURST", 3))
+
+    def acquire(self) -> float:
+        """
+        Take one token, blocking until it is available.
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait > 0:
+            logger.debug(f"Rate limited, waiting {wait:.2f} seconds")
+            self._sleep(wait)
+        return wait
+
+    def __repr__(self):
+        return f"RequestScheduler(rate={self.rate}/s, burst={self.burst})"
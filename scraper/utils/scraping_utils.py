@@ -1,4 +1,5 @@
 import logging
+from datetime import datetime, timedelta, timezone
 
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webelement import WebElement
@@ -22,6 +23,28 @@ SYNC_MAP = {
     "fsdplus.png": "FSDX+",
 }
 
+NOTE_TYPES = ["tap", "hold", "slide", "touch", "break"]
+
+JUDGEMENTS = ["critical", "perfect", "great", "good", "miss"]
+
+# Reads every raw string parse_record_details needs from a playlog detail page in a single WebDriver round trip
+RECORD_DETAILS_SCRIPT = """
+const details = document.querySelector('.gray_block');
+if (!details) {
+    return null;
+}
+const texts = selector => Array.from(details.querySelectorAll(selector), element => element.innerText.trim());
+const notes = [];
+for (let row = 2; row < 2 + arguments[0]; row++) {
+    notes.push(texts(`.playlog_notes_detail tr:nth-child(${row}) td`));
+}
+return {
+    fast_late: texts('.playlog_fl_block div div'),
+    notes: notes,
+    score_block: texts('.playlog_score_block > div')
+};
+"""
+
 RANK_MAP = {
     "d.png": "D",
     "c.png": "C",
@@ -43,6 +66,8 @@ def identify_song_type(song_icon_src: str) -> str:
         return "dx"
     elif song_icon_src.__contains__("music_standard.png"):
         return "standard"
+    elif song_icon_src.__contains__("music_utage.png"):
+        return "utage"
     else:
         return "unknown"
 
@@ -116,12 +141,17 @@ def parse_chart_type(chart_type_image: str) -> str:
 
 def parse_placement(placement_dom: list[WebElement]) -> str | None:
     if placement_dom:
-        icon_src = placement_dom[0].get_attribute("src")
-        return icon_src.split("/")[-1].replace(".png", "")
+        return parse_placement_icon(placement_dom[0].get_attribute("src"))
     else:
         return None
 
 
+def parse_placement_icon(icon_src: str) -> str | None:
+    if not icon_src:
+        return None
+    return icon_src.split("/")[-1].replace(".png", "")
+
+
 def parse_dx_stars(dx_stars_image: str) -> int:
     if not dx_stars_image:  # covers None or empty string
         return 0
@@ -156,3 +186,99 @@ def parse_sync(sync_image: str) -> str | None:
         return None
     filename = sync_image.split("/")[-1].split("?")[0]
     return SYNC_MAP.get(filename.lower())
+
+
+def parse_fraction(fraction_text: str | None) -> tuple[str | None, str | None]:
+    """Split a "current/max" string (e.g. combo or sync) into its two halves."""
+    if fraction_text is None:
+        return None, None
+    if "/" in fraction_text:
+        current, maximum = fraction_text.split("/", 1)
+        return current.strip(), maximum.strip()
+    return fraction_text, fraction_text
+
+
+def parse_count(count_text: str | None) -> int | None:
+    """Parse a counter such as "1,234" into an int, None if the cell is blank or not a number."""
+    count_text = (count_text or "").replace(",", "").strip()
+    return int(count_text) if count_text.isdigit() else None
+
+
+def parse_achievement(achievement_text: str | None) -> float | None:
+    """Parse an achievement string such as "100.5000%" into a float percentage, None if it is not a number."""
+    if not achievement_text:
+        return None
+    try:
+        return float(achievement_text.strip().rstrip("%"))
+    except ValueError:
+        return None
+
+
+def parse_achievement_value(achievement_text: str | None) -> int | None:
+    """
+    Parse an achievement string such as "100.5000%" into an exact integer in ten-thousandths of a percent
+    (1005000), None if it is not a number.
+    """
+    if not achievement_text:
+        return None
+    whole, _, fraction = achievement_text.strip().rstrip("%").partition(".")
+    if not whole.isdigit() or (fraction and not fraction.isdigit()):
+        return None
+    return int(whole) * 10000 + int(fraction[:4].ljust(4, "0"))
+
+
+def parse_dx_score(dx_score_text: str | None) -> tuple[int | None, int | None]:
+    """Parse a DX score string such as "2,345 / 2,500" into (score, max score)."""
+    score, maximum = parse_fraction(dx_score_text)
+    return parse_count(score), parse_count(maximum)
+
+
+def parse_played_at(played_at_text: str | None, date_format: str, utc_offset_hours: int) -> int | None:
+    """
+    Parse a play time as displayed by the site (e.g. "2024/05/01 21:30") into a Unix epoch in seconds.
+
+    Args:
+        played_at_text: Displayed play time.
+        date_format: strptime format of the site, see constants.PlayedAt.
+        utc_offset_hours: UTC offset of the times the site displays.
+
+    Returns:
+        Seconds since the epoch, None if the text does not match the format.
+    """
+    if not played_at_text:
+        return None
+    try:
+        played_at = datetime.strptime(played_at_text.strip(), date_format)
+    except ValueError:
+        return None
+    return int(played_at.replace(tzinfo=timezone(timedelta(hours=utc_offset_hours))).timestamp())
+
+
+def parse_record_details(fast_late: list[str], notes: list[list[str]], score_block: list[str]) -> dict:
+    """Map the raw strings of a playlog detail page onto PlayData field names.
+
+    Args:
+        fast_late: Texts of the fast/late block, in page order.
+        notes: One list of judgement cells per note type row (tap, hold, slide, touch, break).
+        score_block: Texts of the combo and sync blocks, in page order.
+
+    Returns:
+        A dict that can be passed to dataclasses.replace on a PlayData. Blank cells (e.g. the touch row of a
+        standard chart) are None.
+    """
+
+    def at(values: list, index: int):
+        return values[index] if index < len(values) else None
+
+    details = {
+        "fast": parse_count(at(fast_late, 0)),
+        "late": parse_count(at(fast_late, 1)),
+    }
+    for row, note_type in enumerate(NOTE_TYPES):
+        cells = at(notes, row) or []
+        for column, judgement in enumerate(JUDGEMENTS):
+            details[f"{note_type}_{judgement}"] = parse_count(at(cells, column))
+
+    for block, (current, maximum) in enumerate([("combo", "max_combo"), ("sync", "max_sync")]):
+        details[current], details[maximum] = map(parse_count, parse_fraction(at(score_block, block)))
+    return details
@@ -0,0 +1,44 @@
+import logging
+import re
+
+import pytest
+
+from scraper.benchmarks.synthetic import temporary_database
+from scraper.checks.query_plans import ACCESS_PATHS, prepare, statement_plans
+
+
+@pytest.fixture(scope="module")
+def database():
+    logging.disable(logging.INFO)
+    with temporary_database(2000) as database:
+        prepare(database)
+        yield database
+    logging.disable(logging.NOTSET)
+
+
+@pytest.mark.parametrize("name", list(ACCESS_PATHS))
+def test_access_path_uses_an_index(database, name):
+    plans = statement_plans(database, ACCESS_PATHS[name])
+
+    assert plans, f"{name} issued no filtered statement"
+    for sql, scans in plans:
+        assert not scans, f"{name} scans a whole table ({' | '.join(scans)}) : {sql}"
+
+
+def test_achievement_lookup_is_a_range_scan(database):
+    plans = statement_plans(database, ACCESS_PATHS["SSS+ plays"])
+
+    # Traced statements have their parameters expanded
+    sql = next(sql for sql, _ in plans if re.search(r"achievement_value >= \d+", sql))
+    with database.reader() as conn:
+        plan = conn.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+    assert any("USING INDEX idx_play_data_achievement_value (achievement_value>?" in step[3] for step in plan)
+
+
+def test_undetailed_lookup_uses_the_partial_index(database):
+    plans = statement_plans(database, ACCESS_PATHS["find undetailed plays"])
+
+    sql = next(sql for sql, _ in plans if "detailed = 0" in sql)
+    with database.reader() as conn:
+        plan = conn.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+    assert any("USING INDEX idx_play_data_undetailed" in step[3] for step in plan)